@@ -0,0 +1,163 @@
+"""
+アップロード経路のベンチマーク
+
+UploadQueue → DataManager.upload_to_google_sheets → SheetsSession を、
+sheets_fake のローカル代替に対して実行し、キューに積んだセッション数ごとの
+アップロード遅延（スプール保存から送信完了まで）とスループットを表示します。
+
+使い方:
+    python bench_upload.py                                  # 1, 10, 100, 1000セッション
+    python bench_upload.py --sessions 1,50 --latency 0.3    # 応答遅延300ms
+    python bench_upload.py --error-rate 0.1 --quota 60      # エラー注入・リクエスト上限
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from sheets_fake import FakeSheetsClient
+from sheets_session import SheetsSession
+from task_config import RESULT_SCHEMA
+
+
+def make_session_results(participant_name, rng):
+    """全試行に回答した架空のセッション結果を作成"""
+    results = []
+    for trial_num, questions in RESULT_SCHEMA.questions.items():
+        result = {
+            'trial_num': trial_num,
+            'participant_name': participant_name,
+            'dropped_frames': 0,
+            'max_frame_interval_ms': 16.7,
+            'frame_interval_sd_ms': 0.1
+        }
+        for _, spreadsheet_text in questions:
+            result[spreadsheet_text] = str(rng.randint(0, 10))
+            result[f"{spreadsheet_text}_RT"] = round(rng.uniform(0.5, 5.0), 4)
+        results.append(result)
+    return results
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def run_benchmark(session_count, args, work_dir):
+    """指定数のセッションをキューに積み、全件の送信完了まで計測"""
+    # 実験本体（PsychoPyを含む）は計測時のみ読み込む
+    from experiment import UploadQueue
+
+    client = FakeSheetsClient(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        quota_per_minute=args.quota, seed=args.seed
+    )
+    session = SheetsSession(
+        None, "benchmark", "results", client=client,
+        header_cache_path=os.path.join(work_dir, "header_cache.json")
+    )
+    upload_queue = UploadQueue(spool_dir=os.path.join(work_dir, "spool"), session=session)
+    upload_queue.RETRY_BASE_DELAY = args.retry_delay
+    upload_queue.start()
+
+    rng = random.Random(args.seed)
+    enqueued_at = {}
+    start_time = time.perf_counter()
+    for i in range(session_count):
+        participant_info = {
+            'participant_name': f"P{i:04d}",
+            'session_started_at': datetime.now().isoformat()
+        }
+        results = make_session_results(participant_info['participant_name'], rng)
+        spool_path = upload_queue.enqueue(results, participant_info)
+        enqueued_at[spool_path] = time.time()
+    enqueue_elapsed = time.perf_counter() - start_time
+
+    # 全件が完了（または失敗）するまで待つ
+    deadline = time.perf_counter() + args.timeout
+    while time.perf_counter() < deadline:
+        states = [upload_queue.state_of(path) for path in enqueued_at]
+        if all(state.get('status') in ('done', 'failed') for state in states):
+            break
+        time.sleep(0.01)
+    total_elapsed = time.perf_counter() - start_time
+    upload_queue.stop()
+
+    latencies = []
+    failed = 0
+    for path, enqueue_time in enqueued_at.items():
+        state = upload_queue.state_of(path)
+        if state.get('status') == 'done':
+            latencies.append(state['updated_at'] - enqueue_time)
+        else:
+            failed += 1
+
+    requests = client.total_requests()
+    # 送信行数の確認は上限・エラー注入の対象外
+    client.quota_per_minute = None
+    client.error_rate = 0.0
+    worksheet = session.worksheet()
+    uploaded_rows = len(worksheet.get_all_values()) - 1
+
+    return {
+        'sessions': session_count,
+        'done': len(latencies),
+        'failed': failed,
+        'rows': uploaded_rows,
+        'enqueue_ms': enqueue_elapsed / session_count * 1000,
+        'total_s': total_elapsed,
+        'throughput': len(latencies) / total_elapsed if total_elapsed > 0 else 0.0,
+        'p50_s': percentile(latencies, 0.5),
+        'p95_s': percentile(latencies, 0.95),
+        'max_s': max(latencies) if latencies else float('nan'),
+        'requests': requests,
+        'errors': sum(client.error_counts.values())
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Google Sheetsアップロード経路のベンチマーク")
+    parser.add_argument('--sessions', default="1,10,100,1000", help="キューに積むセッション数（カンマ区切り）")
+    parser.add_argument('--latency', type=float, default=0.05, help="1リクエストの応答遅延（秒）")
+    parser.add_argument('--jitter', type=float, default=0.0, help="応答遅延のばらつき（秒）")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="リクエストが失敗する確率")
+    parser.add_argument('--quota', type=int, default=None, help="1分あたりのリクエスト上限")
+    parser.add_argument('--retry-delay', type=float, default=0.05, help="再試行の初回待ち時間（秒）")
+    parser.add_argument('--timeout', type=float, default=3600.0, help="1回の計測の上限時間（秒）")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help="アップロード時のメッセージを表示")
+    args = parser.parse_args(argv)
+
+    session_counts = [int(count) for count in args.sessions.split(',') if count.strip()]
+
+    print(f"応答遅延 {args.latency * 1000:.0f}ms / エラー率 {args.error_rate:.0%} / "
+          f"上限 {args.quota or 'なし'}回/分 / 列数 {len(RESULT_SCHEMA.columns)}")
+    print(f"{'セッション':>10} {'完了':>6} {'失敗':>6} {'行数':>6} {'保存ms':>8} {'合計s':>8} "
+          f"{'件/s':>8} {'p50 s':>8} {'p95 s':>8} {'最大 s':>8} {'要求':>6} {'エラー':>6}")
+
+    for session_count in session_counts:
+        work_dir = tempfile.mkdtemp(prefix="bench_upload_")
+        try:
+            output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+            with output:
+                stats = run_benchmark(session_count, args, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        print(f"{stats['sessions']:>10} {stats['done']:>6} {stats['failed']:>6} {stats['rows']:>6} "
+              f"{stats['enqueue_ms']:>8.2f} {stats['total_s']:>8.2f} {stats['throughput']:>8.1f} "
+              f"{stats['p50_s']:>8.3f} {stats['p95_s']:>8.3f} {stats['max_s']:>8.3f} "
+              f"{stats['requests']:>6} {stats['errors']:>6}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
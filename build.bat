@@ -18,6 +18,10 @@ if not exist "task_config.py" (
     exit /b 1
 )
 
+REM 刺激画像を表示解像度のテクスチャに変換（変更のない画像はスキップ）
+echo 刺激画像をコンパイル中...
+python stimulus_assets.py
+
 REM PyInstallerでビルド
 echo ビルド中...
 pyinstaller experiment.spec
@@ -42,6 +46,12 @@ if exist "images" (
     xcopy "images" "dist\experiment\images\" /e /i /h
 )
 
+REM コンパイル済みテクスチャがある場合
+if exist "compiled_images" (
+    echo コンパイル済みテクスチャをコピー中...
+    xcopy "compiled_images" "dist\experiment\compiled_images\" /e /i /h
+)
+
 echo 全て完了しました！
 echo dist\experiment\experiment.exe を実行してください
 pause
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""
+結果CSVの一括アップロード
+
+save_results_locally が result/ に書き出した <参加者名>_<日時>.csv をまとめて
+Google Spreadsheetに送信します。CSVは列構成ごとにまとめ、実験中のアップロードと同じく
+SheetsSession.ensure_header が返すワークシートへ送信します。書き込み先のシートに既にある行
+（参加者名と実施日時が一致する行）はスキップし、新しい行だけを列構成ごとに1回のリクエストで追加します。
+反応時間・フレーム品質の列は数値に戻して送信します（その他の列は文字列のまま）。
+
+使い方:
+    python bulk_upload.py                    # result/ 内の全CSVを送信
+    python bulk_upload.py --result-dir path  # 別のディレクトリを指定
+    python bulk_upload.py --dry-run          # 送信せずに件数のみ表示
+"""
+import argparse
+import csv
+import glob
+import math
+import os
+import sys
+import time
+
+# 重複判定に使う列（参加者名・実施日時）は実験中のアップロードと共通
+from result_schema import FRAME_QUALITY_FIELDS, KEY_COLUMNS
+from sheets_session import GSPREAD_AVAILABLE, HeaderMismatchError, get_shared_session
+
+
+def read_result_csv(filepath):
+    """結果CSVを読み込み（ヘッダーと行のリスト）"""
+    with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return None, []
+    return rows[0], rows[1:]
+
+
+def numeric_column_indices(header):
+    """数値として送信する列（反応時間・フレーム品質）の列番号"""
+    return [
+        index for index, column in enumerate(header)
+        if column.endswith('_RT') or any(column.endswith(f": {field}") for field in FRAME_QUALITY_FIELDS)
+    ]
+
+
+def to_number(value):
+    """CSVの文字列を数値に変換（空欄や数値でない値はそのまま）"""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    # nan・inf はJSONで送信できないため文字列のまま
+    return number if math.isfinite(number) else value
+
+
+def convert_numeric_fields(rows, header):
+    """反応時間・フレーム品質の列を数値に戻す（実験中のアップロードと同じ型で送信するため）"""
+    indices = numeric_column_indices(header)
+    converted = []
+    for row in rows:
+        row = list(row)
+        for index in indices:
+            if index < len(row):
+                row[index] = to_number(row[index])
+        converted.append(row)
+    return converted
+
+
+def group_by_header(csv_paths):
+    """CSVをヘッダー行（列の並び）ごとにまとめる"""
+    groups = {}
+    skipped_files = []
+
+    for filepath in csv_paths:
+        csv_header, rows = read_result_csv(filepath)
+        if csv_header is None:
+            continue
+
+        if not all(column in csv_header for column in KEY_COLUMNS):
+            print(f"警告: 参加者名・実施日時の列がないためスキップします: {filepath}")
+            skipped_files.append(filepath)
+            continue
+
+        groups.setdefault(tuple(csv_header), []).append((filepath, rows))
+
+    return groups, skipped_files
+
+
+def read_existing_keys(session, worksheet, header):
+    """書き込み先のシートにある行の（参加者名, 実施日時）を取得（重複判定用の列のみ）"""
+    if worksheet is None:
+        return set()
+    return session.existing_keys(worksheet, header, KEY_COLUMNS)
+
+
+def collect_new_rows(files, header, existing_keys):
+    """シートにない行を集める（CSV同士の重複も除外）"""
+    new_rows = []
+    seen_keys = set(existing_keys)
+    skipped_duplicates = 0
+
+    key_indices = [header.index(column) for column in KEY_COLUMNS]
+    for _, rows in files:
+        for row in rows:
+            key = tuple(row[i] if i < len(row) else '' for i in key_indices)
+            if key in seen_keys:
+                skipped_duplicates += 1
+                continue
+            seen_keys.add(key)
+            new_rows.append(row)
+
+    return new_rows, skipped_duplicates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="結果CSVをまとめてGoogle Spreadsheetに送信します")
+    parser.add_argument('--result-dir', default="result", help="結果CSVのディレクトリ")
+    parser.add_argument('--dry-run', action='store_true', help="送信せずに件数のみ表示")
+    args = parser.parse_args(argv)
+
+    if not GSPREAD_AVAILABLE:
+        print("Error: gspread not installed.")
+        return 1
+
+    try:
+        from google_config import SERVICE_ACCOUNT_INFO, SPREADSHEET_NAME, WORKSHEET_NAME
+    except ImportError:
+        print("Error: google_config.py not found.")
+        return 1
+
+    csv_paths = sorted(glob.glob(os.path.join(args.result_dir, "*.csv")))
+    if not csv_paths:
+        print(f"送信するCSVがありません: {args.result_dir}")
+        return 0
+    print(f"CSVファイル: {len(csv_paths)}件")
+
+    groups, skipped_files = group_by_header(csv_paths)
+    if skipped_files:
+        print(f"スキップしたファイル: {len(skipped_files)}件")
+
+    start_time = time.perf_counter()
+    session = get_shared_session(SERVICE_ACCOUNT_INFO, SPREADSHEET_NAME, WORKSHEET_NAME)
+    total_new_rows = 0
+
+    # 列構成ごとに、アップロード時と同じ書き込み先（ensure_header が返すシート）へ送信
+    for header, files in groups.items():
+        header = list(header)
+        try:
+            worksheet = session.ensure_header(header, create=not args.dry_run)
+        except HeaderMismatchError as e:
+            print(f"警告: 書き込み先のシートがないためスキップします（{len(files)}ファイル）: {e}")
+            continue
+
+        title = worksheet.title if worksheet is not None else "（新規作成）"
+        existing_keys = read_existing_keys(session, worksheet, header)
+        new_rows, skipped_duplicates = collect_new_rows(files, header, existing_keys)
+        print(f"[{title}] CSV {len(files)}件 / シートの既存行: {len(existing_keys)}行 / "
+              f"新しい行: {len(new_rows)}行 / 既存と重複: {skipped_duplicates}行")
+
+        if not new_rows or args.dry_run:
+            continue
+
+        session.call(
+            'append_rows', worksheet.append_rows, convert_numeric_fields(new_rows, header),
+            value_input_option='RAW', table_range='A1'
+        )
+        total_new_rows += len(new_rows)
+
+    if args.dry_run:
+        print("--dry-run のため送信しません。")
+        return 0
+    if not total_new_rows:
+        print("送信する行はありません。")
+        return 0
+
+    elapsed = time.perf_counter() - start_time
+    print(f"送信完了: {total_new_rows}行 ({elapsed:.1f}秒)")
+    session.report()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,20 @@
-from psychopy import visual, core, event, data, gui, logging
+from psychopy import visual, core, data, gui, logging
+from psychopy.hardware import keyboard
 import random
 import os
 import pandas as pd
 from datetime import datetime
 import json
 import sys
+import threading
+import queue
+import time
+from collections import OrderedDict
+from PIL import Image
 import psychopy.monitors
+from stimulus_assets import CompiledStimulusStore, target_pixel_size
+from result_schema import KEY_COLUMNS, stimulus_condition
+from result_store import ResultStore
 
 # 安全な終了処理関数
 def safe_quit(win=None):
@@ -33,17 +42,22 @@ def safe_quit(win=None):
         os._exit(0)
 
 # Google Sheets関連のインポート
+from sheets_session import GSPREAD_AVAILABLE, get_shared_session, shared_session
+if not GSPREAD_AVAILABLE:
+    print("Warning: gspread not installed. Google Sheets機能は無効です。")
+
+# 縦持ち結果の列指向保存（Parquet）
 try:
-    import gspread
-    from google.oauth2.service_account import Credentials
-    GSPREAD_AVAILABLE = True
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
 except ImportError:
-    print("Warning: gspread not installed. Google Sheets機能は無効です。")
-    GSPREAD_AVAILABLE = False
+    print("Warning: pyarrow not installed. 縦持ち結果（Parquet）は保存されません。")
+    PYARROW_AVAILABLE = False
 
 # 設定ファイルの読み込み
 try:
-    from task_config import TASKS, TIMING_CONFIG, EXPERIMENT_INFO, GAME_INFO
+    from task_config import TASKS, TIMING_CONFIG, EXPERIMENT_INFO, GAME_INFO, STIMULUS_CONFIG, RESULT_SCHEMA
 except ImportError:
     print("Error: task_config.py not found.")
     sys.exit(1)
@@ -59,6 +73,43 @@ except ImportError:
     SPREADSHEET_NAME = None
     WORKSHEET_NAME = None
 
+# 画面に表示する固定文言
+WELCOME_TEXT_TEMPLATE = '''{experiment_name}
+
+この実験では、ゲーム画面を見た後に質問に回答していただきます。
+
+タスクの流れ：
+1. 注視点（+）を見つめる
+2. ゲーム画面が短時間表示される
+3. 黒い画面になる
+4. 質問に回答する
+
+全部で{total_tasks}個のタスクがあります。
+
+注意：
+・**普段通りゲームをプレイしているつもりで画面を見てください。**
+
+・注視点が現れたら、画面中央を見つめてください
+・途中で止めたい場合は ESC キーを押してください
+
+準備ができたらスペースキーを押して開始してください。'''
+
+PROGRESS_TEXT_TEMPLATE = '''タスク {current}/{total}
+
+準備ができたらスペースキーを押して次のタスクを開始してください。'''
+
+TRANSITION_TEXT_TEMPLATE = '''ここからは{display_name}に関する問題になります。
+
+準備ができたらスペースキーを押してください。'''
+
+END_TEXT = '''全てのタスクが終了しました。
+
+ご協力ありがとうございました！
+
+スペースキーを押して終了してください。'''
+
+COUNTDOWN_NUMBERS = [3, 2, 1]
+
 
 class GoogleSheetsConfig:
     """Google Sheets設定クラス"""
@@ -78,24 +129,429 @@ class ExperimentConfig:
         self.stimulus_duration = TIMING_CONFIG['stimulus_duration'] 
         self.blackout_duration = TIMING_CONFIG['blackout_duration']
         
+        # 刺激画像の読み込み設定
+        self.stimulus_loading_mode = STIMULUS_CONFIG['loading_mode']
+        self.prefetch_memory_budget_mb = STIMULUS_CONFIG['prefetch_memory_budget_mb']
+        
         # タスク設定を外部ファイルから読み込み
         self.tasks = TASKS
         self.total_tasks = len(self.tasks)
 
 
+class StimulusBank:
+    """刺激画像バンククラス（全画像を描画可能な状態で保持）"""
+    
+    def __init__(self, win, image_scale, asset_store=None):
+        self.win = win
+        self.image_scale = image_scale
+        self.asset_store = asset_store
+        self._stims = {}
+    
+    def _create_stim(self, image_path):
+        """画像をデコードしてテクスチャをアップロード"""
+        # コンパイル済みテクスチャがあればデコードせずに使用
+        image = self.asset_store.load(image_path) if self.asset_store else None
+        
+        stim = visual.ImageStim(
+            self.win,
+            image=image if image is not None else image_path,
+            units='norm'
+        )
+        
+        # 事前計算されたスケールを使用
+        stim.size = (self.image_scale, self.image_scale)
+        
+        # 一度描画してテクスチャのアップロードを完了させ、バッファは破棄する
+        stim.draw()
+        self.win.clearBuffer()
+        return stim
+    
+    def preload(self, image_paths, progress_callback=None):
+        """全ての刺激画像を事前に読み込む"""
+        unique_paths = list(dict.fromkeys(image_paths))
+        start_time = core.getTime()
+        
+        for i, image_path in enumerate(unique_paths, 1):
+            if progress_callback is not None:
+                progress_callback(i, len(unique_paths), image_path)
+            
+            try:
+                self._stims[image_path] = self._create_stim(image_path)
+            except Exception as e:
+                print(f"画像読み込みエラー: {image_path}")
+                print(f"エラー詳細: {e}")
+        
+        elapsed = core.getTime() - start_time
+        print(f"刺激画像の事前読み込み完了: {len(self._stims)}/{len(unique_paths)}枚 ({elapsed:.2f}秒)")
+        return len(self._stims)
+    
+    def prefetch(self, image_path):
+        """全画像を事前読み込み済みのため何もしない"""
+        pass
+    
+    def get(self, image_path):
+        """描画可能な刺激を取得"""
+        stim = self._stims.get(image_path)
+        if stim is None:
+            # 事前読み込みされていない画像のみここで読み込む
+            print(f"警告: 事前読み込みされていない画像です: {image_path}")
+            stim = self._create_stim(image_path)
+            self._stims[image_path] = stim
+        return stim
+    
+    def report(self):
+        """読み込み状況を表示"""
+        print(f"刺激画像バンク: 事前読み込み {len(self._stims)}枚")
+    
+    def close(self):
+        """後処理（特になし）"""
+        pass
+
+
+class StimulusPrefetcher:
+    """刺激画像先読みクラス（次試行の画像をバックグラウンドでデコード）"""
+    
+    def __init__(self, win, image_scale, memory_budget_mb=256, asset_store=None):
+        self.win = win
+        self.image_scale = image_scale
+        self.asset_store = asset_store
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        
+        # デコード済みピクセルバッファのLRUキャッシュ（image_path -> PIL.Image）
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self._pending = {}  # デコード中の画像（image_path -> threading.Event）
+        
+        # 描画スレッド側で保持するテクスチャ（直近の1枚のみ）
+        self._current_path = None
+        self._current_stim = None
+        
+        # セッション中のキャッシュ統計
+        self.hits = 0
+        self.misses = 0
+        
+        self._requests = queue.Queue()
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+    
+    def _decode(self, image_path):
+        """画像ファイルをピクセルバッファにデコード"""
+        # コンパイル済みテクスチャがあればメモリマップで読み込む
+        if self.asset_store is not None:
+            image = self.asset_store.load(image_path)
+            if image is not None:
+                return image
+        
+        image = Image.open(image_path)
+        if image.mode not in ('RGB', 'RGBA', 'L'):
+            image = image.convert('RGBA')
+        image.load()
+        return image
+    
+    @staticmethod
+    def _buffer_size(image):
+        """デコード済みバッファのバイト数"""
+        return image.width * image.height * len(image.getbands())
+    
+    def _store(self, image_path, image):
+        """キャッシュに格納し、メモリ上限を超えた分を古い順に破棄"""
+        with self._lock:
+            if image_path in self._cache:
+                self._cache.move_to_end(image_path)
+                return
+            self._cache[image_path] = image
+            self._cache_bytes += self._buffer_size(image)
+            
+            while self._cache_bytes > self.memory_budget and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= self._buffer_size(evicted)
+    
+    def _worker_loop(self):
+        """先読みワーカー"""
+        while True:
+            image_path = self._requests.get()
+            if image_path is None:
+                break
+            
+            try:
+                self._store(image_path, self._decode(image_path))
+            except Exception as e:
+                print(f"画像先読みエラー: {image_path}")
+                print(f"エラー詳細: {e}")
+            finally:
+                with self._lock:
+                    done = self._pending.pop(image_path, None)
+                if done is not None:
+                    done.set()
+    
+    def prefetch(self, image_path):
+        """画像のデコードをバックグラウンドで開始"""
+        with self._lock:
+            if image_path in self._cache or image_path in self._pending:
+                return
+            self._pending[image_path] = threading.Event()
+        self._requests.put(image_path)
+    
+    def _take_decoded(self, image_path):
+        """デコード済みバッファを取得（デコード中なら完了を待つ）"""
+        with self._lock:
+            pending = self._pending.get(image_path)
+        if pending is not None:
+            pending.wait()
+        
+        with self._lock:
+            image = self._cache.get(image_path)
+            if image is not None:
+                self._cache.move_to_end(image_path)
+        
+        if image is not None:
+            self.hits += 1
+            return image
+        
+        # キャッシュミス: 描画スレッドで同期的にデコード
+        self.misses += 1
+        image = self._decode(image_path)
+        self._store(image_path, image)
+        return image
+    
+    def get(self, image_path):
+        """描画可能な刺激を取得（テクスチャのアップロードのみ描画スレッドで行う）"""
+        if image_path == self._current_path:
+            return self._current_stim
+        
+        image = self._take_decoded(image_path)
+        
+        stim = visual.ImageStim(
+            self.win,
+            image=image,
+            units='norm'
+        )
+        stim.size = (self.image_scale, self.image_scale)
+        
+        # 一度描画してテクスチャのアップロードを完了させ、バッファは破棄する
+        stim.draw()
+        self.win.clearBuffer()
+        
+        # 前の試行のテクスチャは保持しない（GPUメモリ節約）
+        self._current_path = image_path
+        self._current_stim = stim
+        return stim
+    
+    def report(self):
+        """キャッシュのヒット・ミス数を表示"""
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total else 0.0
+        print(f"先読みキャッシュ: ヒット {self.hits}回 / ミス {self.misses}回 (ヒット率 {hit_rate:.1f}%)")
+        print(f"先読みキャッシュ使用量: {self._cache_bytes / 1024 / 1024:.1f}MB / {self.memory_budget / 1024 / 1024:.0f}MB")
+    
+    def close(self):
+        """先読みワーカーを停止"""
+        self._requests.put(None)
+
+
+class RefreshRateError(RuntimeError):
+    """リフレッシュレートを特定できない（提示時間をフレーム数に変換できない）"""
+
+
+class FramePresenter:
+    """フレーム同期提示クラス（提示時間をフレーム数に変換し、毎フレーム描画・フリップ）"""
+    
+    # 計測の試行設定（一致させるフレーム数, 許容誤差ms）: 失敗するごとに条件を緩める
+    MEASURE_ATTEMPTS = [(20, 1), (10, 2), (10, 4)]
+    
+    def __init__(self, win):
+        self.win = win
+        self.refresh_rate = self._measure_refresh_rate()
+        self.frame_duration = 1.0 / self.refresh_rate
+    
+    def _measure_refresh_rate(self):
+        """
+        実際のリフレッシュレートを計測（失敗時は条件を緩めて再試行し、
+        それでも計測できなければディスプレイの設定値を使用、どちらもなければ開始しない）
+        """
+        reported = self._reported_refresh_rate()
+        
+        for n_identical, threshold in self.MEASURE_ATTEMPTS:
+            measured = self.win.getActualFrameRate(
+                nIdentical=n_identical, nMaxFrames=300, nWarmUpFrames=20, threshold=threshold
+            )
+            if measured is not None:
+                print(f"リフレッシュレート: {measured:.2f}Hz")
+                if reported and abs(measured - reported) / reported > 0.1:
+                    print(f"警告: 計測値がディスプレイの設定値 ({reported:.0f}Hz) と異なります。")
+                return measured
+            print(f"リフレッシュレートを計測できませんでした（{n_identical}フレーム, 許容誤差{threshold}ms）。")
+        
+        if reported:
+            print(f"警告: 計測できなかったため、ディスプレイの設定値 {reported:.0f}Hz を使用します。")
+            return reported
+        
+        raise RefreshRateError("リフレッシュレートを計測できず、ディスプレイの設定値も取得できませんでした。")
+    
+    def _reported_refresh_rate(self):
+        """ディスプレイの設定上のリフレッシュレート（pygletの画面モード、取得できなければNone）"""
+        try:
+            mode = self.win.winHandle.screen.get_mode()
+            if mode is not None and mode.rate:
+                return float(mode.rate)
+        except Exception:
+            pass
+        return None
+    
+    def frames_for(self, duration):
+        """提示時間をフレーム数に変換"""
+        return max(1, int(round(duration * self.refresh_rate)))
+    
+    def describe(self, timing_config):
+        """各提示時間のフレーム数を表示"""
+        for name, duration in timing_config.items():
+            n_frames = self.frames_for(duration)
+            actual = n_frames * self.frame_duration
+            print(f"  {name}: {duration}秒 -> {n_frames}フレーム ({actual:.4f}秒)")
+    
+    def interval_stats(self, flip_times):
+        """フリップ間隔から落ちたフレーム数・最大間隔・標準偏差を計算"""
+        intervals = [b - a for a, b in zip(flip_times, flip_times[1:])]
+        if not intervals:
+            return {'dropped_frames': 0, 'max_frame_interval_ms': None, 'frame_interval_sd_ms': None}
+        
+        # 1.5フレーム以上の間隔は、間隔に収まるフレーム数-1を落ちたフレームとして数える
+        dropped = 0
+        for interval in intervals:
+            if interval > 1.5 * self.frame_duration:
+                dropped += int(round(interval / self.frame_duration)) - 1
+        
+        mean = sum(intervals) / len(intervals)
+        variance = sum((x - mean) ** 2 for x in intervals) / len(intervals)
+        return {
+            'dropped_frames': dropped,
+            'max_frame_interval_ms': max(intervals) * 1000,
+            'frame_interval_sd_ms': variance ** 0.5 * 1000
+        }
+    
+    def present(self, n_frames, draw=None):
+        """指定フレーム数だけ描画・フリップし、各フリップの時刻を返す"""
+        flip_times = []
+        for _ in range(n_frames):
+            if draw is not None:
+                draw()
+            flip_times.append(self.win.flip())
+        return flip_times
+
+
+class KeyWaiter:
+    """
+    キー待機クラス（タイムスタンプ付きキーボードを一定間隔でポーリングし、状態変化時のみ描画）
+    待機中は毎フレームの描画を行わず、poll_interval秒ごとにキー入力とウィンドウのイベントのみを確認します。
+    （反応時間はキーボードのタイムスタンプから求めるため、ポーリング間隔の影響を受けません）
+    """
+    
+    def __init__(self, win, poll_interval=0.01):
+        self.win = win
+        self.keyboard = keyboard.Keyboard()
+        self.poll_interval = poll_interval
+        
+        # 待機中のCPU使用量（セッション全体の累計、待機しているスレッドのみ計測）
+        self.idle_wall_time = 0.0
+        self.idle_cpu_time = 0.0
+    
+    def _dispatch_window_events(self):
+        """描画せずにウィンドウのイベントだけを処理（応答なし表示を防ぐ）"""
+        dispatch = getattr(self.win.backend, 'dispatchEvents', None)
+        if dispatch is not None:
+            dispatch()
+    
+    def check_escape(self):
+        """ESCキーが押されていれば終了"""
+        if self.keyboard.getKeys(keyList=['escape'], waitRelease=False):
+            safe_quit(self.win)
+    
+    def wait_keys(self, key_list=None, redraw=None, needs_redraw=None):
+        """
+        キー入力があるまで待機します。
+        redrawは待機開始時と、needs_redrawがTrueを返したときのみ呼び出して画面を更新します。
+        ESCキーが押された場合は終了します。
+        """
+        if redraw is not None:
+            redraw()
+            self.win.flip()
+        
+        watch_keys = None if key_list is None else list(key_list) + ['escape']
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        
+        try:
+            while True:
+                keys = self.keyboard.getKeys(keyList=watch_keys, waitRelease=False)
+                if keys:
+                    if any(key.name == 'escape' for key in keys):
+                        safe_quit(self.win)
+                    return keys
+                
+                if needs_redraw is not None and needs_redraw():
+                    redraw()
+                    self.win.flip()
+                
+                self._dispatch_window_events()
+                time.sleep(self.poll_interval)
+        finally:
+            self.idle_wall_time += time.perf_counter() - wall_start
+            self.idle_cpu_time += time.thread_time() - cpu_start
+    
+    def wait_for_space(self, stim):
+        """刺激を一度だけ描画し、スペースキーが押されるまで待機"""
+        self.wait_keys(['space'], redraw=stim.draw)
+    
+    def report(self):
+        """待機中のCPU使用率を表示"""
+        if self.idle_wall_time > 0:
+            cpu_percent = self.idle_cpu_time / self.idle_wall_time * 100
+            print(f"キー待機時間: {self.idle_wall_time:.1f}秒 (待機中のCPU使用率: {cpu_percent:.1f}%)")
+
+
 class ExperimentDisplay:
     """実験画面表示クラス"""
     
-    def __init__(self, win, display_mode='auto'):
+    def __init__(self, win, display_mode='auto', stimulus_loading_mode='preload', prefetch_memory_budget_mb=256,
+                 key_waiter=None):
         self.win = win
         self.display_mode = display_mode  # 'fullscreen', '24inch_max', 'auto'
         
+        # キー待機（同じウィンドウでは一つのキーボードを共有する）
+        self.key_waiter = key_waiter if key_waiter is not None else KeyWaiter(win)
+        
         # ディスプレイ情報を一度だけ取得
         self.screen_width = self.win.size[0]
         self.screen_height = self.win.size[1]
         
         # 画像表示スケールを事前計算
         self._calculate_image_scale()
+        
+        # コンパイル済みテクスチャ（stimulus_assets.pyで作成、なければ元画像をデコード）
+        self.image_pixel_size = target_pixel_size(self.screen_width, self.screen_height, self.image_scale)
+        self.asset_store = CompiledStimulusStore(self.image_pixel_size)
+        
+        # 刺激画像バンク（'preload': preload_stimuliで事前読み込み / 'prefetch': 次試行を先読み）
+        if stimulus_loading_mode == 'prefetch':
+            self.stimulus_bank = StimulusPrefetcher(
+                self.win, self.image_scale, prefetch_memory_budget_mb, asset_store=self.asset_store
+            )
+        else:
+            self.stimulus_bank = StimulusBank(self.win, self.image_scale, asset_store=self.asset_store)
+        
+        # フレーム同期提示（measure_refresh_rateで初期化）
+        self.presenter = None
+        self.last_flip_times = {}
+        
+        # 注視点（全試行で同じ刺激を使い回す）
+        self.fixation = self.create_text_stim(
+            text='+',
+            height=0.3,
+            color='black',
+            bold=True,
+            wrapWidth=None
+        )
     
     def _calculate_image_scale(self):
         """画像表示スケールを計算"""
@@ -130,6 +586,8 @@ class ExperimentDisplay:
         """テキスト刺激を作成します。"""
         if 'wrapWidth' not in kwargs:
             kwargs['wrapWidth'] = 1.8
+        kwargs.setdefault('anchorHoriz', 'center')
+        kwargs.setdefault('anchorVert', 'center')
             
         return visual.TextStim(
             self.win,
@@ -137,74 +595,249 @@ class ExperimentDisplay:
             height=height,
             color=color,
             font='MS Gothic',
-            anchorHoriz='center',
-            anchorVert='center',
             **kwargs
         )
     
+    def preload_stimuli(self, image_paths):
+        """読み込み画面を表示しながら全刺激画像を事前読み込み"""
+        self.win.color = 'black'
+        
+        loading_msg = self.create_text_stim(text='', height=0.06)
+        bar_frame = visual.Rect(
+            self.win, width=1.2, height=0.06, pos=(0, -0.2),
+            lineColor='white', fillColor=None, units='norm'
+        )
+        bar_fill = visual.Rect(
+            self.win, width=0.0, height=0.06, pos=(-0.6, -0.2),
+            lineColor=None, fillColor='white', units='norm'
+        )
+        
+        def show_progress(current, total, image_path):
+            loading_msg.text = f"刺激画像を読み込み中...\n\n{current}/{total}"
+            bar_fill.width = 1.2 * current / total
+            bar_fill.pos = (-0.6 + bar_fill.width / 2, -0.2)
+            loading_msg.draw()
+            bar_frame.draw()
+            bar_fill.draw()
+            self.win.flip()
+            
+            # 読み込み中もESCで中断可能にする
+            self.key_waiter.check_escape()
+        
+        return self.stimulus_bank.preload(image_paths, progress_callback=show_progress)
+    
+    def prepare_image(self, image_path):
+        """試行開始前に刺激を描画可能な状態にする"""
+        try:
+            self.stimulus_bank.get(image_path)
+        except Exception as e:
+            print(f"画像読み込みエラー: {image_path}")
+            print(f"エラー詳細: {e}")
+    
+    def measure_refresh_rate(self):
+        """リフレッシュレートを計測し、フレーム同期提示を準備"""
+        self.presenter = FramePresenter(self.win)
+        return self.presenter
+    
+    def _present(self, phase, duration, draw=None):
+        """フレーム同期で提示し、フリップ時刻を記録"""
+        if self.presenter is None:
+            self.measure_refresh_rate()
+        flip_times = self.presenter.present(self.presenter.frames_for(duration), draw)
+        self.last_flip_times[phase] = flip_times
+        return flip_times[0]
+    
     def show_fixation(self, duration):
         """注視点を表示"""
         self.win.color = 'grey'
-        self.win.flip()
-        core.wait(0.1)
+        self._present('pre_fixation', 0.1)
         
-        fixation = self.create_text_stim(
-            text='+',
-            height=0.3,
-            color='black',
-            bold=True,
-            wrapWidth=None
-        )
-        fixation.draw()
-        onset = self.win.flip()
-        core.wait(duration)
-        return onset
+        return self._present('fixation', duration, self.fixation.draw)
     
     def show_image(self, image_path, duration):
-        """画像を表示（スケールは初期化時に決定済み）"""
+        """画像を表示（事前読み込み済みの刺激を描画するのみ）"""
         self.win.color = 'black'
         
         try:
-            game_image = visual.ImageStim(
-                self.win, 
-                image=image_path,
-                units='norm'
-            )
-            
-            # 事前計算されたスケールを使用
-            game_image.size = (self.image_scale, self.image_scale)
-            
-            game_image.draw()
-            onset = self.win.flip()
-            core.wait(duration)
-            return onset
-            
+            game_image = self.stimulus_bank.get(image_path)
         except Exception as e:
             print(f"画像読み込みエラー: {image_path}")
             print(f"エラー詳細: {e}")
             return None
+        
+        return self._present('stimulus', duration, game_image.draw)
     
     def show_blackout(self, duration):
         """ブラックアウトを表示"""
         self.win.color = 'black'
-        onset = self.win.flip()
-        core.wait(duration)
-        return onset
+        return self._present('blackout', duration)
+
+
+class GlyphPrewarmer:
+    """グリフ事前ラスタライズクラス（セッション中の全文字を共有フォントアトラスに展開）"""
+    
+    def __init__(self, display):
+        self.display = display
+        # フォントアトラスがキャッシュから外れないよう刺激を保持
+        self._warm_stims = []
+        self.glyph_count = 0
+        self.elapsed = 0.0
+    
+    def prewarm(self, strings_by_style):
+        """文字サイズ・太字の組み合わせごとに全文字を一度だけラスタライズ"""
+        start_time = core.getTime()
+        
+        for (height, bold), strings in strings_by_style.items():
+            chars = sorted(set(''.join(strings)) - set('\n '))
+            if not chars:
+                continue
+            
+            stim = self.display.create_text_stim(
+                text=''.join(chars),
+                height=height,
+                bold=bold
+            )
+            stim.draw()
+            self._warm_stims.append(stim)
+            self.glyph_count += len(chars)
+        
+        # 描画内容は表示せずに破棄
+        self.display.win.clearBuffer()
+        
+        self.elapsed = core.getTime() - start_time
+        print(f"グリフの事前ラスタライズ完了: {self.glyph_count}グリフ ({self.elapsed:.2f}秒)")
+        return self.glyph_count
+
+
+class ScreenDeck:
+    """静的画面デッキクラス（開始・進捗・切り替え・カウントダウン・終了画面を事前に作成）"""
+    
+    def __init__(self, display, config, total_trials):
+        self.display = display
+        
+        self.welcome = self._prepare(display.create_text_stim(
+            WELCOME_TEXT_TEMPLATE.format(
+                experiment_name=EXPERIMENT_INFO['name'],
+                total_tasks=config.total_tasks
+            ),
+            height=0.06
+        ))
+        
+        # 進捗画面は2試行目以降のみ表示
+        self.progress = {
+            current: self._prepare(display.create_text_stim(
+                PROGRESS_TEXT_TEMPLATE.format(current=current, total=total_trials),
+                height=0.08
+            ))
+            for current in range(2, total_trials + 1)
+        }
+        
+        self.transitions = {
+            game: self._prepare(display.create_text_stim(
+                text=TRANSITION_TEXT_TEMPLATE.format(display_name=game_info['display_name']),
+                height=0.08,
+                color='lightblue'
+            ))
+            for game, game_info in GAME_INFO.items()
+        }
+        
+        self.countdown = [
+            self._prepare(display.create_text_stim(
+                text=str(count),
+                height=0.2,
+                color='white',
+                bold=True
+            ))
+            for count in COUNTDOWN_NUMBERS
+        ]
+        
+        self.end = self._prepare(display.create_text_stim(END_TEXT, height=0.08))
+        
+        # 準備のための描画内容は表示せずに破棄
+        display.win.clearBuffer()
+        print(f"静的画面を作成しました: {len(self.progress) + len(self.transitions) + len(self.countdown) + 2}画面")
+    
+    @staticmethod
+    def _prepare(stim):
+        """一度描画してテキストのレイアウトを確定させる"""
+        stim.draw()
+        return stim
+
+
+def collect_session_strings(config):
+    """セッション中に表示する全文字列を文字サイズ・太字ごとに収集"""
+    # 回答として入力され得る英数字・記号
+    typed_chars = ''.join(chr(c) for c in range(0x21, 0x7f))
+    
+    question_strings = [
+        QuestionInterface.TEXT_INSTRUCTION,
+        QuestionInterface.TEXT_FOOTER,
+        QuestionInterface.CHOICE_FOOTER,
+        QuestionInterface.MULTIPLE_CHOICE_FOOTER,
+        QuestionInterface.ANSWER_PREFIX,
+        QuestionInterface.FINAL_HEADER,
+        QuestionInterface.FINAL_FOOTER,
+        '質問 0123456789/',
+        typed_chars
+    ] + QuestionInterface.MARKERS
+    for task in config.tasks:
+        for question in task['questions']:
+            question_strings.append(question['display_text'])
+            question_strings.extend(question.get('choices', []))
+            question_strings.append('選択なし; ')
+    
+    screen_strings = [END_TEXT, PROGRESS_TEXT_TEMPLATE.format(current=config.total_tasks, total=config.total_tasks)]
+    screen_strings.append('0123456789')
+    for game_info in GAME_INFO.values():
+        screen_strings.append(TRANSITION_TEXT_TEMPLATE.format(display_name=game_info['display_name']))
+    
+    welcome_strings = [
+        WELCOME_TEXT_TEMPLATE.format(experiment_name=EXPERIMENT_INFO['name'], total_tasks=config.total_tasks),
+        '0123456789'
+    ]
+    
+    return {
+        (0.04, False): question_strings,   # 回答確認画面
+        (0.045, False): question_strings,  # 複数選択
+        (0.05, False): question_strings,   # テキスト入力・単一選択
+        (0.06, False): welcome_strings,
+        (0.08, False): screen_strings,
+        (0.2, True): [''.join(str(count) for count in COUNTDOWN_NUMBERS)],
+        (0.3, True): ['+']
+    }
 
 
 class QuestionInterface:
     """質問インターフェースクラス (選択肢対応版)"""
+    
+    # 質問画面の固定文言
+    TEXT_INSTRUCTION = "英数字で回答を入力してください"
+    TEXT_FOOTER = "Enter: 確定 | Backspace: 削除 | ESC: 終了"
+    CHOICE_FOOTER = "↑↓: 選択  Enter: 確定  ESC: 終了"
+    MULTIPLE_CHOICE_FOOTER = "↑↓: 移動  Space: 選択/解除  Enter: 確定  ESC: 終了"
+    ANSWER_PREFIX = "回答: "
+    FINAL_HEADER = "回答完了！\n\n入力した回答:\n"
+    FINAL_FOOTER = "\nスペースキーを押して次のタスクに進んでください。"
+    MARKERS = ["→", "[ ]", "[✓]", "_"]
 
-    def __init__(self, win):
-        self.win = win
-        self.display = ExperimentDisplay(win)
+    def __init__(self, display):
+        # 実験画面と同じ表示・キー待機・刺激バンクを共有する
+        self.display = display
+        self.win = display.win
+        self.key_waiter = display.key_waiter
+        self.stimulus_bank = display.stimulus_bank
 
-    def show_questions(self, questions):
+    def show_questions(self, questions, next_image_path=None):
         """
-        質問画面を表示し、回答を取得します。
+        質問画面を表示し、回答と反応時間を取得します。
         テキスト入力、選択肢、複数選択に対応します。
+        回答中に次の試行の画像を先読みします。
         """
+        if next_image_path and self.stimulus_bank is not None:
+            self.stimulus_bank.prefetch(next_image_path)
+        
         answers = []
+        responses = []
         self.win.color = 'black'
 
         for i, question_data in enumerate(questions, 1):
@@ -213,26 +846,29 @@ class QuestionInterface:
             
             if question_type == 'text':
                 # テキスト入力（従来の方法）
-                answer = self._handle_text_question(display_question, i, len(questions))
+                answer, response = self._handle_text_question(display_question, i, len(questions))
                 answers.append(answer)
+                responses.append(response)
                 
             elif question_type == 'choice':
                 # 単一選択
                 choices = question_data['choices']
-                answer = self._handle_choice_question(display_question, choices, i, len(questions))
+                answer, response = self._handle_choice_question(display_question, choices, i, len(questions))
                 answers.append(answer)
+                responses.append(response)
                 
             elif question_type == 'multiple_choice':
                 # 複数選択
                 choices = question_data['choices']
-                answer = self._handle_multiple_choice_question(display_question, choices, i, len(questions))
+                answer, response = self._handle_multiple_choice_question(display_question, choices, i, len(questions))
                 answers.append(answer)
+                responses.append(response)
 
         # 全問回答後の確認画面
-        final_text = "回答完了！\n\n入力した回答:\n"
+        final_text = self.FINAL_HEADER
         for i, ans in enumerate(answers, 1):
             final_text += f"{i}. {ans}\n"
-        final_text += "\nスペースキーを押して次のタスクに進んでください。"
+        final_text += self.FINAL_FOOTER
 
         final_stim = self.display.create_text_stim(
             text=final_text,
@@ -241,96 +877,157 @@ class QuestionInterface:
             wrapWidth=1.8
         )
 
-        waiting = True
-        while waiting:
-            final_stim.draw()
-            self.win.flip()
-            
-            keys = event.getKeys()
-            for key in keys:
-                if key == 'escape':
-                    safe_quit(self.win)
-                elif key == 'space':
-                    waiting = False
-                    break
-            
-            core.wait(0.01)
+        # 内容は変化しないため一度だけ描画し、スペースキーを待つ
+        self.key_waiter.wait_for_space(final_stim)
         
-        return answers
+        return answers, responses
+    
+    def _start_response_clock(self):
+        """次のフリップ（質問の提示）を反応時間の基準にする"""
+        self.key_waiter.keyboard.clearEvents()
+        self.win.callOnFlip(self.key_waiter.keyboard.clock.reset)
+    
+    @staticmethod
+    def _response(final_key, edit_keys):
+        """確定キーまでの反応時間と途中の編集キーの記録"""
+        return {'rt': final_key.rt, 'edit_keys': edit_keys}
+
+    @staticmethod
+    def _choice_layout(n_choices, line_height):
+        """選択肢画面の縦方向の配置を計算（質問文・各選択肢・操作説明のy座標）"""
+        choices_top = line_height * (n_choices - 1) / 2
+        choice_ys = [choices_top - i * line_height for i in range(n_choices)]
+        prompt_y = choices_top + line_height
+        footer_y = choices_top - n_choices * line_height - line_height
+        return prompt_y, choice_ys, footer_y
 
     def _handle_text_question(self, display_question, current_q, total_q):
         """テキスト入力質問を処理"""
         current_text = ""
         
-        while True:
-            instruction_text = (
+        # 刺激は一度だけ作成し、回答行のみ更新する
+        prompt_stim = self.display.create_text_stim(
+            text=(
                 f"質問 {current_q}/{total_q}\n\n"
                 f"{display_question}\n\n"
-                "英数字で回答を入力してください\n\n"
-                "回答: {}\n\n"
-                "Enter: 確定 | Backspace: 削除 | ESC: 終了"
-            ).format(current_text + "_")
-            
-            question_stim = self.display.create_text_stim(
-                text=instruction_text,
-                height=0.05,
-                pos=(0, 0),
-                wrapWidth=1.8
-            )
-            
-            question_stim.draw()
-            self.win.flip()
+                f"{self.TEXT_INSTRUCTION}"
+            ),
+            height=0.05,
+            pos=(0, 0.05),
+            wrapWidth=1.8,
+            anchorVert='bottom'
+        )
+        answer_stim = self.display.create_text_stim(
+            text=f"{self.ANSWER_PREFIX}_",
+            height=0.05,
+            pos=(0, -0.1),
+            wrapWidth=1.8
+        )
+        footer_stim = self.display.create_text_stim(
+            text=self.TEXT_FOOTER,
+            height=0.05,
+            pos=(0, -0.3),
+            wrapWidth=1.8
+        )
+        
+        # 質問の提示（最初のフリップ）から反応時間を計測
+        self._start_response_clock()
+        edit_keys = []
+        
+        dirty = True
+        while True:
+            # 変化があったときのみ描画・フリップ
+            if dirty:
+                prompt_stim.draw()
+                answer_stim.draw()
+                footer_stim.draw()
+                self.win.flip()
+                dirty = False
             
-            keys = event.getKeys()
+            # キー入力があるまで待機（描画・フリップはしない）
+            key_presses = self.key_waiter.wait_keys()
+            previous_text = current_text
             
-            for key in keys:
-                if key == 'escape':
-                    safe_quit(self.win)
-                elif key == 'return':
+            for key_press in key_presses:
+                key = key_press.name
+                if key == 'return':
                     if current_text.strip():
-                        return current_text.strip()
+                        return current_text.strip(), self._response(key_press, edit_keys)
                 elif key == 'backspace':
                     current_text = current_text[:-1]
                 elif key == 'space':
                     current_text += " "
                 elif len(key) == 1 and (key.isalnum() or key in ".,!?-()%"):
                     current_text += key
+                edit_keys.append([key, key_press.rt])
             
-            core.wait(0.01)
+            if current_text != previous_text:
+                answer_stim.text = f"{self.ANSWER_PREFIX}{current_text}_"
+                dirty = True
 
     def _handle_choice_question(self, display_question, choices, current_q, total_q):
         """単一選択質問を処理"""
         selected_index = 0
         
-        while True:
-            # 質問と選択肢を表示
-            choice_text = f"質問 {current_q}/{total_q}\n\n{display_question}\n\n"
-            
-            for i, choice in enumerate(choices):
-                if i == selected_index:
-                    choice_text += f"→ {i+1}. {choice}\n"
-                else:
-                    choice_text += f"   {i+1}. {choice}\n"
-            
-            choice_text += "\n↑↓: 選択  Enter: 確定  ESC: 終了"
-            
-            question_stim = self.display.create_text_stim(
-                text=choice_text,
-                height=0.05,
-                pos=(0, 0),
-                wrapWidth=1.8
+        # 刺激は一度だけ作成し、選択マーカーの位置のみ更新する
+        height = 0.05
+        prompt_y, choice_ys, footer_y = self._choice_layout(len(choices), height * 1.6)
+        
+        prompt_stim = self.display.create_text_stim(
+            text=f"質問 {current_q}/{total_q}\n\n{display_question}",
+            height=height,
+            pos=(0, prompt_y),
+            wrapWidth=1.8,
+            anchorVert='bottom'
+        )
+        choice_stims = [
+            self.display.create_text_stim(
+                text=f"{i+1}. {choice}",
+                height=height,
+                pos=(-0.45, y),
+                wrapWidth=1.4,
+                anchorHoriz='left'
             )
+            for i, (choice, y) in enumerate(zip(choices, choice_ys))
+        ]
+        marker_stim = self.display.create_text_stim(
+            text="→",
+            height=height,
+            pos=(-0.5, choice_ys[selected_index]),
+            wrapWidth=None,
+            anchorHoriz='right'
+        )
+        footer_stim = self.display.create_text_stim(
+            text=self.CHOICE_FOOTER,
+            height=height,
+            pos=(0, footer_y),
+            wrapWidth=1.8
+        )
+        
+        # 質問の提示（最初のフリップ）から反応時間を計測
+        self._start_response_clock()
+        edit_keys = []
+        
+        dirty = True
+        while True:
+            # 変化があったときのみ描画・フリップ
+            if dirty:
+                prompt_stim.draw()
+                for choice_stim in choice_stims:
+                    choice_stim.draw()
+                marker_stim.draw()
+                footer_stim.draw()
+                self.win.flip()
+                dirty = False
             
-            question_stim.draw()
-            self.win.flip()
-            
-            keys = event.getKeys()
+            # キー入力があるまで待機（描画・フリップはしない）
+            key_presses = self.key_waiter.wait_keys()
+            previous_index = selected_index
             
-            for key in keys:
-                if key == 'escape':
-                    safe_quit(self.win)
-                elif key == 'return':
-                    return choices[selected_index]
+            for key_press in key_presses:
+                key = key_press.name
+                if key == 'return':
+                    return choices[selected_index], self._response(key_press, edit_keys)
                 elif key == 'up':
                     selected_index = (selected_index - 1) % len(choices)
                 elif key == 'down':
@@ -340,147 +1037,166 @@ class QuestionInterface:
                     num = int(key)
                     if 1 <= num <= len(choices):
                         selected_index = num - 1
+                edit_keys.append([key, key_press.rt])
             
-            core.wait(0.01)
+            if selected_index != previous_index:
+                marker_stim.pos = (-0.5, choice_ys[selected_index])
+                dirty = True
 
     def _handle_multiple_choice_question(self, display_question, choices, current_q, total_q):
         """複数選択質問を処理"""
         selected_indices = []
         current_index = 0
         
-        while True:
-            # 質問と選択肢を表示
-            choice_text = f"質問 {current_q}/{total_q}\n\n{display_question}\n\n"
-            
-            for i, choice in enumerate(choices):
-                marker = "→" if i == current_index else "  "
-                check = "✓" if i in selected_indices else " "
-                choice_text += f"{marker} [{check}] {i+1}. {choice}\n"
-            
-            choice_text += "\n↑↓: 移動  Space: 選択/解除  Enter: 確定  ESC: 終了"
-            
-            question_stim = self.display.create_text_stim(
-                text=choice_text,
-                height=0.045,
-                pos=(0, 0),
-                wrapWidth=1.8
+        # 刺激は一度だけ作成し、マーカーとチェックの位置のみ更新する
+        height = 0.045
+        prompt_y, choice_ys, footer_y = self._choice_layout(len(choices), height * 1.6)
+        
+        prompt_stim = self.display.create_text_stim(
+            text=f"質問 {current_q}/{total_q}\n\n{display_question}",
+            height=height,
+            pos=(0, prompt_y),
+            wrapWidth=1.8,
+            anchorVert='bottom'
+        )
+        choice_stims = [
+            self.display.create_text_stim(
+                text=f"{i+1}. {choice}",
+                height=height,
+                pos=(-0.4, y),
+                wrapWidth=1.4,
+                anchorHoriz='left'
             )
+            for i, (choice, y) in enumerate(zip(choices, choice_ys))
+        ]
+        marker_stim = self.display.create_text_stim(
+            text="→",
+            height=height,
+            pos=(-0.55, choice_ys[current_index]),
+            wrapWidth=None,
+            anchorHoriz='right'
+        )
+        # チェックボックスは2種類を作成し、各行の位置に移動して描画する
+        unchecked_stim = self.display.create_text_stim(
+            text="[ ]", height=height, wrapWidth=None, anchorHoriz='left'
+        )
+        checked_stim = self.display.create_text_stim(
+            text="[✓]", height=height, wrapWidth=None, anchorHoriz='left'
+        )
+        footer_stim = self.display.create_text_stim(
+            text=self.MULTIPLE_CHOICE_FOOTER,
+            height=height,
+            pos=(0, footer_y),
+            wrapWidth=1.8
+        )
+        
+        # 質問の提示（最初のフリップ）から反応時間を計測
+        self._start_response_clock()
+        edit_keys = []
+        
+        dirty = True
+        while True:
+            # 変化があったときのみ描画・フリップ
+            if dirty:
+                prompt_stim.draw()
+                for i, (choice_stim, y) in enumerate(zip(choice_stims, choice_ys)):
+                    box_stim = checked_stim if i in selected_indices else unchecked_stim
+                    box_stim.pos = (-0.53, y)
+                    box_stim.draw()
+                    choice_stim.draw()
+                marker_stim.draw()
+                footer_stim.draw()
+                self.win.flip()
+                dirty = False
             
-            question_stim.draw()
-            self.win.flip()
-            
-            keys = event.getKeys()
+            # キー入力があるまで待機（描画・フリップはしない）
+            key_presses = self.key_waiter.wait_keys()
             
-            for key in keys:
-                if key == 'escape':
-                    safe_quit(self.win)
-                elif key == 'return':
+            for key_press in key_presses:
+                key = key_press.name
+                if key == 'return':
                     if selected_indices:
                         selected_choices = [choices[i] for i in sorted(selected_indices)]
-                        return "; ".join(selected_choices)
+                        return "; ".join(selected_choices), self._response(key_press, edit_keys)
                     else:
-                        return "選択なし"
+                        return "選択なし", self._response(key_press, edit_keys)
                 elif key == 'up':
                     current_index = (current_index - 1) % len(choices)
+                    dirty = True
                 elif key == 'down':
                     current_index = (current_index + 1) % len(choices)
+                    dirty = True
                 elif key == 'space':
                     if current_index in selected_indices:
                         selected_indices.remove(current_index)
                     else:
                         selected_indices.append(current_index)
+                    dirty = True
+                edit_keys.append([key, key_press.rt])
             
-            core.wait(0.01)
+            if dirty:
+                marker_stim.pos = (-0.55, choice_ys[current_index])
 
 
 class DataManager:
     """データ管理クラス"""
     
     @staticmethod
-    def upload_to_google_sheets(results, participant_info):
-        """結果をGoogle Spreadsheetに保存（質問一つにつき一列）"""
-        if not GOOGLE_SHEETS_ENABLED:
-            print("Google Sheets機能が無効です。")
-            return False, None
+    def build_result_row(results, participant_info):
+        """結果スキーマに従って参加者ごとの1行（列名と値）を作成"""
+        started_at = participant_info.get('session_started_at') or datetime.now().isoformat()
+        row = RESULT_SCHEMA.build_row(results, participant_info['participant_name'], started_at)
+        return RESULT_SCHEMA.columns, row
+    
+    @staticmethod
+    def upload_to_google_sheets(results, participant_info, session=None, skip_existing=False):
+        """
+        結果をGoogle Spreadsheetに保存（質問一つにつき一列）
+        skip_existing=True の場合は、同じ参加者名・実施日時の行が既にあれば追加しません
+        （前回の送信が完了していた可能性がある再送信で、行の重複を防ぐため）。
+        """
+        if session is None:
+            if not GOOGLE_SHEETS_ENABLED:
+                print("Google Sheets機能が無効です。")
+                return False, None
             
-        try:
             sheets_config = GoogleSheetsConfig()
             
-            # 認証
-            credentials = Credentials.from_service_account_info(
+            # 認証済みのセッションをプロセス内で共有（認証・ハンドル取得は初回のみ）
+            session = get_shared_session(
                 sheets_config.SERVICE_ACCOUNT_INFO,
-                scopes=[
-                    'https://www.googleapis.com/auth/spreadsheets',
-                    'https://www.googleapis.com/auth/drive'
-                ]
+                sheets_config.SPREADSHEET_NAME,
+                sheets_config.WORKSHEET_NAME
             )
+        
+        try:
+            spreadsheet = session.spreadsheet()
             
-            # Google Sheets APIクライアント作成
-            gc = gspread.authorize(credentials)
+            # データを参加者ごとに1行にまとめる（列構成はtask_configから作成済み）
+            headers, participant_row = DataManager.build_result_row(results, participant_info)
             
-            # スプレッドシートを開く（存在しない場合は作成）
-            try:
-                spreadsheet = gc.open(sheets_config.SPREADSHEET_NAME)
-            except gspread.SpreadsheetNotFound:
-                spreadsheet = gc.create(sheets_config.SPREADSHEET_NAME)
-                print(f"新しいスプレッドシートを作成しました: {sheets_config.SPREADSHEET_NAME}")
+            # ヘッダーを確認（1行目のみ読み込み、確認済みならキャッシュを使用）
+            # 列構成が変わった場合は列ずれを防ぐため別のワークシートに書き込む
+            worksheet = session.ensure_header(headers)
             
-            # ワークシートを取得または作成
-            try:
-                worksheet = spreadsheet.worksheet(sheets_config.WORKSHEET_NAME)
-            except gspread.WorksheetNotFound:
-                worksheet = spreadsheet.add_worksheet(
-                    title=sheets_config.WORKSHEET_NAME,
-                    rows=1000,
-                    cols=100
-                )
-            
-            # 順序を保った質問列の作成（task_configの順序に従う）
-            ordered_columns = []
-            question_counter = 1
-            
-            # task_configから直接順序を取得
-            from task_config import TASKS
-            for task in TASKS:
-                for question in task['questions']:
-                    spreadsheet_text = question['spreadsheet_text']
-                    ordered_columns.append(f"Q{question_counter}: {spreadsheet_text}")
-                    question_counter += 1
-            
-            # データを参加者ごとに1行にまとめる
-            participant_row = [participant_info['participant_name']]
-            participant_row.append(datetime.now().isoformat())
-            
-            # 各質問列の値を順番に追加
-            for column_header in ordered_columns:
-                # "Q1: VALO_味方キャラクター数_低刺激" から "VALO_味方キャラクター数_低刺激" を抽出
-                spreadsheet_text = column_header.split(": ", 1)[1]
-                
-                # 該当する質問の回答を探す
-                answer = ""
-                for result in results:
-                    if spreadsheet_text in result:
-                        answer = result[spreadsheet_text]
-                        break
-                participant_row.append(answer)
-            
-            # ヘッダーを作成（初回のみ）
-            existing_data = worksheet.get_all_values()
-            if not existing_data or not existing_data[0]:
-                headers = ['参加者名', '実施日時'] + ordered_columns
-                worksheet.append_row(headers)
+            key = tuple(participant_row[headers.index(column)] for column in KEY_COLUMNS)
+            if skip_existing and key in session.existing_keys(worksheet, headers, KEY_COLUMNS):
+                print(f"同じ参加者名・実施日時の行が既にあるため追加しません: {key[0]} ({key[1]})")
+                return True, spreadsheet.url
             
             # データ行を追加
-            worksheet.append_row(participant_row)
+            session.call('append_row', worksheet.append_row, participant_row)
             
             print(f"結果をGoogle Spreadsheetに保存しました")
-            print(f"スプレッドシート: {sheets_config.SPREADSHEET_NAME}")
+            print(f"スプレッドシート: {session.spreadsheet_name}")
             print(f"URL: {spreadsheet.url}")
             
             return True, spreadsheet.url
             
         except Exception as e:
             print(f"Google Spreadsheetへの保存でエラーが発生しました: {e}")
+            # 次回は各ハンドルを取得し直す
+            session.invalidate()
             return False, None
     
     @staticmethod
@@ -496,31 +1212,11 @@ class DataManager:
             filename = f"{participant_info['participant_name']}_{timestamp}.csv"
             filepath = os.path.join(result_dir, filename)
             
-            # データを参加者ごとに1行にまとめる
-            row_data = {'参加者名': participant_info['participant_name']}
-            row_data['実施日時'] = datetime.now().isoformat()
-            
-            # 順序を保った質問列の作成（task_configの順序に従う）
-            from task_config import TASKS
-            question_counter = 1
-            
-            for task in TASKS:
-                for question in task['questions']:
-                    spreadsheet_text = question['spreadsheet_text']
-                    column_header = f"Q{question_counter}: {spreadsheet_text}"
-                    
-                    # 該当する質問の回答を探す
-                    answer = ""
-                    for result in results:
-                        if spreadsheet_text in result:
-                            answer = result[spreadsheet_text]
-                            break
-                    
-                    row_data[column_header] = answer
-                    question_counter += 1
+            # データを参加者ごとに1行にまとめる（列構成はtask_configから作成済み）
+            columns, row = DataManager.build_result_row(results, participant_info)
             
             # データフレームを作成
-            df = pd.DataFrame([row_data])
+            df = pd.DataFrame([row], columns=columns)
             df.to_csv(filepath, index=False, encoding='utf-8-sig')
             
             print(f"ローカルバックアップを保存しました: {filepath}")
@@ -528,6 +1224,389 @@ class DataManager:
         except Exception as e:
             print(f"ローカル保存でエラーが発生しました: {e}")
             return False, None
+    
+    @staticmethod
+    def long_format_schema():
+        """縦持ち結果（参加者×質問で1行）の列と型"""
+        return pa.schema([
+            ('participant', pa.string()),
+            ('session_started_at', pa.string()),
+            ('trial_num', pa.int16()),
+            ('game', pa.string()),
+            ('condition', pa.string()),
+            ('image_path', pa.string()),
+            ('question_num', pa.int16()),
+            ('question_key', pa.string()),
+            ('answer', pa.string()),
+            ('rt', pa.float64()),
+            ('fixation_onset', pa.float64()),
+            ('stimulus_onset', pa.float64()),
+            ('stimulus_offset', pa.float64()),
+            ('stimulus_duration_actual', pa.float64()),
+            ('stimulus_frames', pa.int32()),
+            ('dropped_frames', pa.int32()),
+            ('refresh_rate', pa.float64()),
+        ])
+    
+    @staticmethod
+    def build_long_records(results, participant_info):
+        """試行ごとの結果を縦持ち（参加者×質問で1行）の列データに変換"""
+        schema = DataManager.long_format_schema()
+        columns = {name: [] for name in schema.names}
+        started_at = participant_info.get('session_started_at') or datetime.now().isoformat()
+        
+        for result in sorted(results, key=lambda r: r['trial_num']):
+            for question_num, spreadsheet_text in RESULT_SCHEMA.questions.get(result['trial_num'], []):
+                answer = result.get(spreadsheet_text)
+                columns['participant'].append(participant_info['participant_name'])
+                columns['session_started_at'].append(started_at)
+                columns['trial_num'].append(result['trial_num'])
+                columns['game'].append(get_game_from_image_path(result['image_path']))
+                columns['condition'].append(stimulus_condition(spreadsheet_text))
+                columns['image_path'].append(result['image_path'])
+                columns['question_num'].append(question_num)
+                columns['question_key'].append(spreadsheet_text)
+                columns['answer'].append(None if answer is None else str(answer))
+                columns['rt'].append(result.get(f"{spreadsheet_text}_RT"))
+                for field in ['fixation_onset', 'stimulus_onset', 'stimulus_offset',
+                              'stimulus_duration_actual', 'stimulus_frames',
+                              'dropped_frames', 'refresh_rate']:
+                    columns[field].append(result.get(field))
+        
+        return schema, columns
+    
+    @staticmethod
+    def save_results_long(results, participant_info):
+        """縦持ち結果をParquetファイルとして保存（複数セッションをまとめて読み込み可能）"""
+        if not PYARROW_AVAILABLE:
+            return False, None
+        
+        try:
+            result_dir = "result"
+            if not os.path.exists(result_dir):
+                os.makedirs(result_dir)
+            
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{participant_info['participant_name']}_{timestamp}.parquet"
+            filepath = os.path.join(result_dir, filename)
+            
+            schema, columns = DataManager.build_long_records(results, participant_info)
+            table = pa.Table.from_pydict(columns, schema=schema)
+            
+            # 書き込み途中で壊れたファイルが残らないよう置き換えで保存
+            tmp_path = filepath + ".tmp"
+            pq.write_table(table, tmp_path, compression='zstd')
+            os.replace(tmp_path, filepath)
+            
+            print(f"縦持ち結果を保存しました: {filepath} ({table.num_rows}行)")
+            return True, filepath
+        except Exception as e:
+            print(f"縦持ち結果の保存でエラーが発生しました: {e}")
+            return False, None
+
+
+class UploadQueue:
+    """Google Sheetsアップロードキュー（ローカルスプールに保存し、バックグラウンドで再試行）"""
+    
+    SPOOL_DIR = os.path.join("result", "upload_spool")
+    
+    # 再試行間隔（秒）: 初回2秒から倍々で最大5分、1回の起動につき最大8回
+    RETRY_BASE_DELAY = 2.0
+    RETRY_MAX_DELAY = 300.0
+    MAX_ATTEMPTS = 8
+    
+    # 終了時に送信中のアップロードの完了を待つ時間（秒）
+    STOP_TIMEOUT = 15.0
+    
+    def __init__(self, spool_dir=None, session=None):
+        self.spool_dir = spool_dir or self.SPOOL_DIR
+        # 送信先のセッション（Noneなら google_config の共有セッション）
+        self.session = session
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        
+        # スプールファイルごとの状態（画面表示用）
+        self.item_states = {}
+        self.version = 0
+        
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+    
+    def start(self):
+        """
+        前回の起動で残ったスプールを再投入し、ワーカーを開始
+        （送信は試行の提示と重ならないよう、全試行の終了後に開始してください）
+        """
+        if not os.path.exists(self.spool_dir):
+            os.makedirs(self.spool_dir)
+        
+        pending = sorted(f for f in os.listdir(self.spool_dir) if f.endswith(".json"))
+        for filename in pending:
+            # 前回の送信が完了した直後に終了した可能性があるため、送信前にシートを確認
+            self._submit(os.path.join(self.spool_dir, filename), recovered=True)
+        if pending:
+            print(f"前回アップロードできなかったセッション: {len(pending)}件を再試行します")
+        
+        self._worker.start()
+    
+    def _set_state(self, spool_path, **state):
+        with self._lock:
+            self.item_states.setdefault(spool_path, {}).update(state, updated_at=time.time())
+            self.version += 1
+    
+    def _submit(self, spool_path, recovered=False):
+        self._set_state(spool_path, status='pending', attempts=0, recovered=recovered)
+        self._queue.put(spool_path)
+    
+    def enqueue(self, results, participant_info):
+        """セッション結果をスプールに書き込み、アップロードを予約"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        spool_path = os.path.join(self.spool_dir, f"{participant_info['participant_name']}_{timestamp}.json")
+        
+        # 書き込み途中のファイルを残さないよう置き換えで保存
+        tmp_path = spool_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'results': results, 'participant_info': participant_info}, f, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, spool_path)
+        
+        self._submit(spool_path)
+        return spool_path
+    
+    def _upload(self, spool_path):
+        """スプールの1件をアップロード（失敗時は指数バックオフで再試行）"""
+        with open(spool_path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        
+        recovered = self.state_of(spool_path).get('recovered', False)
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            self._set_state(spool_path, status='uploading', attempts=attempt)
+            # 再試行時は、失敗した送信が実際には追加されていた場合に備えて既存の行を確認
+            success, url = DataManager.upload_to_google_sheets(
+                entry['results'], entry['participant_info'], self.session,
+                skip_existing=recovered or attempt > 1
+            )
+            if success:
+                os.remove(spool_path)
+                self._set_state(spool_path, status='done', url=url)
+                return True
+            
+            if attempt == self.MAX_ATTEMPTS:
+                break
+            delay = min(self.RETRY_BASE_DELAY * 2 ** (attempt - 1), self.RETRY_MAX_DELAY)
+            self._set_state(spool_path, status='retrying', next_retry_at=time.time() + delay)
+            if self._stop.wait(delay):
+                break
+        
+        # スプールに残し、次回起動時に再試行
+        self._set_state(spool_path, status='failed')
+        return False
+    
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                spool_path = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            try:
+                self._upload(spool_path)
+            except Exception as e:
+                print(f"アップロードキューでエラーが発生しました: {spool_path} ({e})")
+                self._set_state(spool_path, status='failed')
+    
+    def state_of(self, spool_path):
+        with self._lock:
+            return dict(self.item_states.get(spool_path, {}))
+    
+    def pending_count(self):
+        with self._lock:
+            return sum(1 for state in self.item_states.values()
+                       if state.get('status') in ('pending', 'uploading', 'retrying'))
+    
+    def status_text(self, spool_path):
+        """画面表示用のアップロード状況"""
+        state = self.state_of(spool_path)
+        status = state.get('status')
+        
+        if status == 'done':
+            text = "✓ Google Spreadsheetに保存されました\n"
+            if state.get('url'):
+                text += f"URL: {state['url']}\n"
+        elif status == 'uploading':
+            text = f"… Google Spreadsheetにアップロード中 ({state['attempts']}回目)\n"
+        elif status == 'retrying':
+            remaining = max(0, int(state['next_retry_at'] - time.time()))
+            text = f"… アップロードに失敗しました。{remaining}秒後に再試行します ({state['attempts']}回失敗)\n"
+        elif status == 'failed':
+            text = "✗ Google Spreadsheetへの保存に失敗しました（次回起動時に再試行します）\n"
+        else:
+            text = "… Google Spreadsheetへのアップロード待ち\n"
+        
+        others = self.pending_count() - (1 if status in ('pending', 'uploading', 'retrying') else 0)
+        if others > 0:
+            text += f"（他に未送信のセッション: {others}件）\n"
+        return text
+    
+    def stop(self, timeout=None):
+        """ワーカーを停止し、送信中のアップロードの完了を待つ（未送信分はスプールに残る）"""
+        self._stop.set()
+        if self._worker.is_alive():
+            self._worker.join(self.STOP_TIMEOUT if timeout is None else timeout)
+            if self._worker.is_alive():
+                print("警告: アップロードの完了を待たずに終了します（次回起動時にシートを確認して再試行します）")
+
+
+class SessionJournal:
+    """セッション結果の追記型ジャーナル（1試行ごとに1レコードをディスクに同期）"""
+    
+    # 1回の書き込みがこの時間を超えたら警告（秒）
+    WRITE_WARNING_THRESHOLD = 0.05
+    
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.write_times = []
+    
+    @classmethod
+    def create(cls, participant_info, total_tasks, result_dir="result"):
+        """新しいジャーナルを作成し、セッション情報を記録"""
+        if not os.path.exists(result_dir):
+            os.makedirs(result_dir)
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{participant_info['participant_name']}_{timestamp}.journal.jsonl"
+        journal = cls(os.path.join(result_dir, filename))
+        
+        journal._append({
+            'type': 'session',
+            'participant_name': participant_info['participant_name'],
+            'started_at': participant_info['session_started_at'],
+            'total_tasks': total_tasks
+        })
+        print(f"セッションジャーナル: {journal.filepath}")
+        return journal
+    
+    def _append(self, record):
+        """1レコードを追記し、ディスクに同期するまで待つ"""
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with open(self.filepath, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def append_trial(self, result):
+        """完了した試行の結果を記録（試行間に呼び出し、書き込み時間を計測）"""
+        start_time = time.perf_counter()
+        self._append({'type': 'trial', 'result': result})
+        elapsed = time.perf_counter() - start_time
+        self.write_times.append(elapsed)
+        
+        if elapsed > self.WRITE_WARNING_THRESHOLD:
+            print(f"警告: ジャーナルの書き込みに時間がかかりました ({elapsed * 1000:.1f}ms)")
+        return elapsed
+    
+    def complete(self, outputs):
+        """
+        全試行の完了と出力の保存を記録（CSV保存・アップロードのスプール後に呼び出す）
+        outputs: 保存した出力（'csv'・'long'・'spool' -> ファイルパス）
+        """
+        self._append({
+            'type': 'complete',
+            'finished_at': datetime.now().isoformat(),
+            'outputs_saved': True,
+            'outputs': outputs
+        })
+    
+    def abandon(self, reason):
+        """再開しないセッションとして記録（以降の再開確認の対象から外す）"""
+        self._append({'type': 'abandoned', 'abandoned_at': datetime.now().isoformat(), 'reason': reason})
+        print(f"中断されたセッションを破棄済みとして記録しました: {self.filepath} ({reason})")
+    
+    @staticmethod
+    def mismatch_reason(session, results, tasks):
+        """ジャーナルが現在のタスク構成と一致しない理由（一致する場合はNone）"""
+        if session.get('total_tasks') != len(tasks):
+            return f"タスク数が異なります（記録: {session.get('total_tasks')} / 現在: {len(tasks)}）"
+        
+        for result in results:
+            trial_num = result.get('trial_num')
+            if not isinstance(trial_num, int) or not 1 <= trial_num <= len(tasks):
+                return f"試行番号が範囲外です: {trial_num}"
+            if result.get('image_path') != tasks[trial_num - 1]['image_path']:
+                return (f"試行{trial_num}の画像が異なります"
+                        f"（記録: {result.get('image_path')} / 現在: {tasks[trial_num - 1]['image_path']}）")
+        return None
+    
+    @classmethod
+    def find_unfinished(cls, participant_name, result_dir="result"):
+        """同じ参加者の未完了セッションのうち最新のものを探す"""
+        if not os.path.exists(result_dir):
+            return None
+        
+        candidates = sorted(
+            (f for f in os.listdir(result_dir) if f.endswith(".journal.jsonl")),
+            key=lambda f: os.path.getmtime(os.path.join(result_dir, f)),
+            reverse=True
+        )
+        for filename in candidates:
+            filepath = os.path.join(result_dir, filename)
+            try:
+                session, results, status = cls.read(filepath)
+            except Exception as e:
+                print(f"ジャーナルの読み込みに失敗しました: {filepath} ({e})")
+                continue
+            
+            # 完了済み・破棄済みのセッションは対象外
+            if session is not None and session['participant_name'] == participant_name and status is None:
+                return cls(filepath), session, results
+        return None
+    
+    @staticmethod
+    def read(filepath):
+        """
+        ジャーナルを読み込み（セッション情報・試行結果・終了状態）
+        終了状態は 'complete'（全試行完了・出力保存済み）・'abandoned'（再開せずに破棄）・None（未完了）
+        出力の保存が記録されていない完了レコードは未完了として扱い、再開時に出力を作り直します。
+        """
+        session = None
+        results = []
+        status = None
+        
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 書き込み途中で中断された最終行は無視
+                    print(f"警告: 読み込めないジャーナル行をスキップしました: {filepath}")
+                    continue
+                
+                if record['type'] == 'session':
+                    session = record
+                elif record['type'] == 'trial':
+                    results.append(record['result'])
+                elif record['type'] == 'complete' and record.get('outputs_saved'):
+                    status = 'complete'
+                elif record['type'] == 'abandoned':
+                    status = 'abandoned'
+        
+        return session, results, status
+    
+    def load_results(self):
+        """記録済みの試行結果を読み込み"""
+        _, results, _ = self.read(self.filepath)
+        return results
+    
+    def report(self):
+        """書き込み時間の統計を表示"""
+        if self.write_times:
+            avg_ms = sum(self.write_times) / len(self.write_times) * 1000
+            max_ms = max(self.write_times) * 1000
+            print(f"ジャーナル書き込み: {len(self.write_times)}回 (平均 {avg_ms:.1f}ms, 最大 {max_ms:.1f}ms)")
 
 
 def get_participant_info():
@@ -556,18 +1635,57 @@ def get_participant_info():
             return get_participant_info()  # 再帰的に再試行
 
 
-def create_trial_list(config):
-    """試行リストを作成"""
+def ask_resume_session(participant_info, config):
+    """同じ参加者の中断されたセッションがあれば、再開するかを確認"""
+    unfinished = SessionJournal.find_unfinished(participant_info['participant_name'])
+    if unfinished is None:
+        return None
+    
+    journal, session, results = unfinished
+    
+    # タスク構成が変わっていれば、試行番号と画像の対応がずれるため再開しない
+    reason = SessionJournal.mismatch_reason(session, results, config.tasks)
+    if reason is not None:
+        print(f"警告: 中断されたセッションは現在のタスク構成と一致しないため再開できません: {reason}")
+        journal.abandon(f"タスク構成の不一致: {reason}")
+        return None
+    
+    dlg = gui.Dlg(title="中断されたセッション")
+    dlg.addText(f"{participant_info['participant_name']} の中断されたセッションが見つかりました。")
+    dlg.addText(f"開始日時: {session['started_at']} / 完了済み: {len(results)}/{config.total_tasks}タスク")
+    if len(results) >= config.total_tasks:
+        # 全試行の完了後、結果の保存前に中断されたセッション
+        dlg.addText("全タスクが完了しています。再開すると結果の保存・アップロードのみを行います。")
+    dlg.addField("続きから再開しますか？ (Yes/No):", "Yes")
+    dlg.show()
+    
+    if dlg.OK and dlg.data[0].lower() in ['yes', 'y']:
+        return journal, session, results
+    
+    journal.abandon("参加者が再開しないことを選択")
+    return None
+
+
+def create_trial_list(config, completed_trial_nums=None):
+    """試行リストを作成（再開時は完了済みの試行を除く）"""
     trials = []
+    completed_trial_nums = completed_trial_nums or set()
     
     # すべてのタスクを1回ずつ使用（順序はそのまま）
     for i, task in enumerate(config.tasks):
+        if i + 1 in completed_trial_nums:
+            continue
+        
         trial = {
             'trial_num': i + 1,
             'task_data': task
         }
         trials.append(trial)
     
+    # 先読み用に次の試行の画像パスを記録
+    for trial, next_trial in zip(trials, trials[1:] + [None]):
+        trial['next_image_path'] = next_trial['task_data']['image_path'] if next_trial else None
+    
     return trials
 
 
@@ -582,44 +1700,36 @@ def get_game_from_image_path(image_path):
     return None
 
 
-def show_game_transition(win, display, current_game, next_game):
+def show_game_transition(win, display, current_game, next_game, screen_deck=None):
     """ゲーム切り替え画面を表示"""
     if next_game and next_game in GAME_INFO:
-        transition_text = f'''ここからは{GAME_INFO[next_game]['display_name']}に関する問題になります。
-
-準備ができたらスペースキーを押してください。'''
-        
-        transition_msg = display.create_text_stim(
-            text=transition_text, 
-            height=0.08,
-            color='lightblue'
-        )
-        
-        # より安全なキー待機処理
-        waiting = True
-        while waiting:
-            transition_msg.draw()
-            win.flip()
+        if screen_deck is not None and next_game in screen_deck.transitions:
+            # 事前に作成した画面を使用
+            transition_msg = screen_deck.transitions[next_game]
+        else:
+            transition_text = TRANSITION_TEXT_TEMPLATE.format(display_name=GAME_INFO[next_game]['display_name'])
             
-            keys = event.getKeys()
-            for key in keys:
-                if key == 'escape':
-                    safe_quit(win)
-                elif key == 'space':
-                    waiting = False
-                    break
-            core.wait(0.01)
+            transition_msg = display.create_text_stim(
+                text=transition_text, 
+                height=0.08,
+                color='lightblue'
+            )
+        
+        # 一度だけ描画し、スペースキーを待つ
+        display.key_waiter.wait_for_space(transition_msg)
 
 
 def run_trial(win, trial, config, display, question_interface):
     """1試行（1タスク）を実行"""
     
     # ESCキーでの中断チェック
-    if 'escape' in event.getKeys():
-        safe_quit(win)
+    display.key_waiter.check_escape()
     
     task_data = trial['task_data']
     
+    # 刺激を描画可能な状態にしておく（注視点以降に読み込みを発生させない）
+    display.prepare_image(task_data['image_path'])
+    
     # 1. 黒画面（初期化）
     win.color = 'black'
     win.flip()
@@ -636,25 +1746,44 @@ def run_trial(win, trial, config, display, question_interface):
     # 4. ブラックアウト
     blackout_onset = display.show_blackout(config.blackout_duration)
     
+    # 注視点→刺激→ブラックアウト区間のフレーム間隔を集計
+    frame_stats = display.presenter.interval_stats(
+        display.last_flip_times.get('fixation', []) +
+        display.last_flip_times.get('stimulus', []) +
+        display.last_flip_times.get('blackout', [])
+    )
+    
     # 5. 質問回答
-    answers = question_interface.show_questions(task_data['questions'])
+    answers, responses = question_interface.show_questions(
+        task_data['questions'],
+        next_image_path=trial.get('next_image_path')
+    )
     
     # 結果をまとめる - 各質問を個別に記録
+    # 刺激の消失時刻はブラックアウト最初のフリップ時刻（フレーム単位で正確）
     result = {
         'trial_num': trial['trial_num'],
         'image_path': task_data['image_path'],
         'fixation_onset': fixation_onset,
         'stimulus_onset': stimulus_onset,
+        'stimulus_offset': blackout_onset,
         'blackout_onset': blackout_onset,
         'stimulus_duration_actual': blackout_onset - stimulus_onset,
+        'fixation_frames': len(display.last_flip_times.get('fixation', [])),
+        'stimulus_frames': len(display.last_flip_times.get('stimulus', [])),
+        'blackout_frames': len(display.last_flip_times.get('blackout', [])),
+        'refresh_rate': display.presenter.refresh_rate,
         'timestamp': datetime.now().isoformat()
     }
+    result.update(frame_stats)
     
-    # 各質問と回答を個別に記録
-    for i, (question, answer) in enumerate(zip(task_data['questions'], answers), 1):
+    # 各質問と回答・反応時間を個別に記録
+    for i, (question, answer, response) in enumerate(zip(task_data['questions'], answers, responses), 1):
         # spreadsheet_textを使用して列名を設定
         spreadsheet_text = question.get('spreadsheet_text', f'Question_{i}')
         result[spreadsheet_text] = answer
+        result[f"{spreadsheet_text}_RT"] = response['rt']
+        result[f"{spreadsheet_text}_keys"] = response['edit_keys']
     
     return result
 
@@ -668,6 +1797,18 @@ def run_experiment():
     # 設定読み込み
     config = ExperimentConfig()
     
+    # アップロードキュー（試行の提示中に通信しないよう、全試行の終了後に開始）
+    upload_queue = UploadQueue()
+    
+    # 中断されたセッションがあれば再開するか確認
+    resume_state = ask_resume_session(participant_info, config)
+    if resume_state is not None:
+        journal, session, completed_results = resume_state
+        participant_info['session_started_at'] = session['started_at']
+    else:
+        journal = None
+        completed_results = []
+    
     # ディスプレイサイズを取得してウィンドウ設定を決定
     monitor = psychopy.monitors.Monitor('testMonitor')
     screen_size = monitor.getSizePix()
@@ -696,55 +1837,63 @@ def run_experiment():
     win.mouseVisible = False
     
     # 表示クラスを初期化（画像表示モードを指定）
-    display = ExperimentDisplay(win, display_mode='24inch_max')
-    question_interface = QuestionInterface(win)
+    display = ExperimentDisplay(
+        win,
+        display_mode='24inch_max',
+        stimulus_loading_mode=config.stimulus_loading_mode,
+        prefetch_memory_budget_mb=config.prefetch_memory_budget_mb
+    )
+    question_interface = QuestionInterface(display)
     
     # 試行リスト作成
-    trials = create_trial_list(config)
+    trials = create_trial_list(config, {r['trial_num'] for r in completed_results})
     
-    # 実験開始メッセージ
-    welcome_text = f'''{EXPERIMENT_INFO['name']}
-
-この実験では、ゲーム画面を見た後に質問に回答していただきます。
-
-タスクの流れ：
-1. 注視点（+）を見つめる
-2. ゲーム画面が短時間表示される
-3. 黒い画面になる
-4. 質問に回答する
-
-全部で{config.total_tasks}個のタスクがあります。
-
-注意：
-・**普段通りゲームをプレイしているつもりで画面を見てください。**
-
-・注視点が現れたら、画面中央を見つめてください
-・途中で止めたい場合は ESC キーを押してください
-
-準備ができたらスペースキーを押して開始してください。'''
+    if config.stimulus_loading_mode == 'prefetch':
+        # 最初の試行の画像のみ先読み（以降は回答中に次の画像を先読み）
+        if trials:
+            display.stimulus_bank.prefetch(trials[0]['task_data']['image_path'])
+    else:
+        # 刺激画像を事前読み込み（試行中の画像デコードを避ける）
+        display.preload_stimuli([trial['task_data']['image_path'] for trial in trials])
     
-    welcome_msg = display.create_text_stim(welcome_text, height=0.06)
+    # リフレッシュレートを計測し、各提示時間をフレーム数に変換
+    # （特定できない場合は提示時間が保証できないため開始しない）
+    try:
+        presenter = display.measure_refresh_rate()
+    except RefreshRateError as e:
+        print(f"エラー: {e}")
+        print("他のアプリケーションを終了してから、もう一度実行してください。")
+        safe_quit(win)
+    print("提示時間のフレーム数:")
+    presenter.describe(TIMING_CONFIG)
     
-    # より安全なキー待機処理
-    waiting = True
-    while waiting:
-        welcome_msg.draw()
-        win.flip()
-        
-        keys = event.getKeys()
-        for key in keys:
-            if key == 'escape':
-                safe_quit(win)
-            elif key == 'space':
-                waiting = False
-                break
-        core.wait(0.01)
+    # 表示する全文字を事前にラスタライズ（試行中のグリフ生成を避ける）
+    glyph_prewarmer = GlyphPrewarmer(display)
+    glyph_prewarmer.prewarm(collect_session_strings(config))
+    
+    # 静的画面を事前に作成（試行間にテキストのレイアウトを行わない）
+    screen_deck = ScreenDeck(display, config, config.total_tasks)
+    
+    # 実験開始メッセージ（一度だけ描画し、スペースキーを待つ）
+    display.key_waiter.wait_for_space(screen_deck.welcome)
     
-    # 結果記録用リスト
-    results = []
+    # 結果記録用ジャーナル（1試行ごとにディスクへ同期）
+    if journal is None:
+        participant_info['session_started_at'] = datetime.now().isoformat()
+        journal = SessionJournal.create(participant_info, config.total_tasks)
     
-    # ゲーム切り替え管理用変数
+    # ローカルの結果データベース（解析用、試行ごとに1トランザクションで記録）
+    result_store = ResultStore(RESULT_SCHEMA, get_game_from_image_path)
+    result_store.begin_session(participant_info, config.total_tasks, journal.filepath)
+    if completed_results:
+        result_store.record_trials(completed_results)
+    
+    # ゲーム切り替え管理用変数（再開時は最後に完了した試行のゲームを復元）
     current_game = None
+    if completed_results:
+        last_result = max(completed_results, key=lambda r: r['trial_num'])
+        current_game = get_game_from_image_path(last_result['image_path'])
+        print(f"セッションを再開します: {len(completed_results)}/{config.total_tasks}タスク完了済み ({journal.filepath})")
     
     # 各試行を実行
     for i, trial in enumerate(trials):
@@ -754,41 +1903,17 @@ def run_experiment():
         # ゲームが変わったかチェック
         if current_game != next_game and next_game is not None:
             # ゲーム切り替え画面を表示
-            show_game_transition(win, display, current_game, next_game)
+            show_game_transition(win, display, current_game, next_game, screen_deck)
             current_game = next_game
         
         # 進捗表示（最初の試行以外）
         if i > 0:
-            progress_text = f'''タスク {i+1}/{len(trials)}
-
-準備ができたらスペースキーを押して次のタスクを開始してください。'''
-            
-            progress_msg = display.create_text_stim(progress_text, height=0.08)
-            
-            # より安全なキー待機処理
-            waiting = True
-            while waiting:
-                progress_msg.draw()
-                win.flip()
-                
-                keys = event.getKeys()
-                for key in keys:
-                    if key == 'escape':
-                        safe_quit(win)
-                    elif key == 'space':
-                        waiting = False
-                        break
-                core.wait(0.01)
+            # 一度だけ描画し、スペースキーを待つ
+            display.key_waiter.wait_for_space(screen_deck.progress[trial['trial_num']])
         
         # カウントダウン（最初の試行のみ）
         if i == 0:
-            for count in [3, 2, 1]:
-                countdown = display.create_text_stim(
-                    text=str(count),
-                    height=0.2,
-                    color='white',
-                    bold=True
-                )
+            for countdown in screen_deck.countdown:
                 countdown.draw()
                 win.flip()
                 core.wait(1.0)
@@ -797,75 +1922,77 @@ def run_experiment():
         result = run_trial(win, trial, config, display, question_interface)
         if result:
             result.update(participant_info)
-            results.append(result)
+            # 次の試行を始める前にディスクへ同期（提示中には書き込まない）
+            journal.append_trial(result)
+            result_store.record_trials([result])
     
-    # 実験終了メッセージ
-    end_text = '''全てのタスクが終了しました。
-
-ご協力ありがとうございました！
-
-スペースキーを押して終了してください。'''
-    
-    end_msg = display.create_text_stim(end_text, height=0.08)
+    result_store.complete_session()
     
-    # より安全なキー待機処理
-    waiting = True
-    while waiting:
-        end_msg.draw()
-        win.flip()
-        
-        keys = event.getKeys()
-        for key in keys:
-            if key == 'escape':
-                safe_quit(win)
-            elif key == 'space':
-                waiting = False
-                break
-        core.wait(0.01)
+    # アップロードキューを開始（前回送信できなかったセッションも再試行）
+    if GOOGLE_SHEETS_ENABLED:
+        upload_queue.start()
     
-    # 結果を保存
+    # 結果を保存（ジャーナルから最終出力を作成、終了画面の前に保存する）
     print("\n=== 結果を保存中 ===")
+    results = journal.load_results()
     
-    # 1. Google Spreadsheetに保存を試行
-    sheets_success, sheets_url = DataManager.upload_to_google_sheets(results, participant_info)
-    
-    # 2. ローカルにバックアップ保存
+    # 1. ローカルにバックアップ保存
     local_success, local_filename = DataManager.save_results_locally(results, participant_info)
+    _, long_filename = DataManager.save_results_long(results, participant_info)
     
-    # 保存結果の表示
-    save_status_text = "=== 保存完了 ===\n\n"
-    
-    if sheets_success:
-        save_status_text += "✓ Google Spreadsheetに保存されました\n"
-        if sheets_url:
-            save_status_text += f"URL: {sheets_url}\n\n"
-    else:
-        save_status_text += "✗ Google Spreadsheetへの保存に失敗しました\n\n"
+    # 2. Google Spreadsheetへのアップロードをキューに追加（バックグラウンドで送信）
+    spool_path = None
+    if GOOGLE_SHEETS_ENABLED:
+        try:
+            spool_path = upload_queue.enqueue(results, participant_info)
+        except Exception as e:
+            print(f"アップロードのスプール保存でエラーが発生しました: {e}")
     
+    # 出力の保存後に完了を記録（保存前に中断した場合は、次回起動時に再開して保存をやり直せる）
     if local_success:
-        save_status_text += f"✓ ローカルバックアップ: {local_filename}\n\n"
+        journal.complete({'csv': local_filename, 'long': long_filename, 'spool': spool_path})
     else:
-        save_status_text += "✗ ローカル保存に失敗しました\n\n"
+        print("警告: ローカル保存に失敗したため、セッションを未完了のまま残します（次回起動時に再開すると保存をやり直します）")
     
-    save_status_text += "スペースキーを押して終了してください。"
+    # 実験終了メッセージ（一度だけ描画し、スペースキーを待つ）
+    display.key_waiter.wait_for_space(screen_deck.end)
+    
+    def build_save_status_text():
+        """保存結果の表示（アップロード状況は随時更新）"""
+        save_status_text = "=== 保存状況 ===\n\n"
+        
+        if spool_path is not None:
+            save_status_text += upload_queue.status_text(spool_path) + "\n"
+        else:
+            save_status_text += "✗ Google Spreadsheetへの保存は無効です\n\n"
+        
+        if local_success:
+            save_status_text += f"✓ ローカルバックアップ: {local_filename}\n\n"
+        else:
+            save_status_text += "✗ ローカル保存に失敗しました\n\n"
+        
+        save_status_text += "スペースキーを押して終了してください。"
+        return save_status_text
     
     # 保存結果を画面に表示
-    save_status_msg = display.create_text_stim(save_status_text, height=0.06)
-    
-    # より安全なキー待機処理
-    waiting = True
-    while waiting:
-        save_status_msg.draw()
-        win.flip()
-        
-        keys = event.getKeys()
-        for key in keys:
-            if key == 'escape':
-                core.quit()
-            elif key == 'space':
-                waiting = False
-                break
-        core.wait(0.01)
+    save_status_msg = display.create_text_stim(build_save_status_text(), height=0.06)
+    shown_state = {'text': save_status_msg.text}
+    
+    def save_status_changed():
+        # 状況が変わったときのみテキストを更新して再描画
+        text = build_save_status_text()
+        if text == shown_state['text']:
+            return False
+        shown_state['text'] = text
+        save_status_msg.text = text
+        return True
+    
+    # アップロード状況が変わったときのみ再描画し、スペースキーを待つ
+    display.key_waiter.wait_keys(['space'], redraw=save_status_msg.draw, needs_redraw=save_status_changed)
+    
+    sheets_state = upload_queue.state_of(spool_path) if spool_path is not None else {}
+    sheets_success = sheets_state.get('status') == 'done'
+    sheets_url = sheets_state.get('url')
     
     # 基本統計を表示
     print(f"\n=== 実験結果 ===")
@@ -877,6 +2004,8 @@ def run_experiment():
         print(f"Google Spreadsheet保存: 成功")
         if sheets_url:
             print(f"スプレッドシートURL: {sheets_url}")
+    elif spool_path is not None:
+        print(f"Google Spreadsheet保存: 未完了 (スプール: {spool_path}、次回起動時に再試行します)")
     else:
         print(f"Google Spreadsheet保存: 失敗")
     
@@ -891,6 +2020,32 @@ def run_experiment():
         avg_duration = sum(actual_durations) / len(actual_durations)
         print(f"\n実際の刺激提示時間: 平均 {avg_duration:.4f}秒 (目標: {config.stimulus_duration}秒)")
     
+    # フレーム落ちのあった試行
+    dropped_trials = [r for r in results if r.get('dropped_frames')]
+    if dropped_trials:
+        print(f"フレーム落ちのあった試行: {len(dropped_trials)}/{len(results)}")
+        for r in dropped_trials:
+            print(f"  試行{r['trial_num']}: {r['dropped_frames']}フレーム落ち (最大間隔 {r['max_frame_interval_ms']:.1f}ms)")
+    else:
+        print("フレーム落ちのあった試行: なし")
+    
+    # ジャーナルの書き込み時間
+    journal.report()
+    
+    # 刺激画像の読み込み状況
+    display.stimulus_bank.report()
+    
+    # キー待機中のCPU使用率
+    display.key_waiter.report()
+    
+    # Google Sheets API呼び出しの所要時間
+    if shared_session() is not None:
+        shared_session().report()
+    
+    display.stimulus_bank.close()
+    result_store.close()
+    upload_queue.stop()
+    
     win.close()
     # core.quit()
 
@@ -16,6 +16,10 @@ datas += collect_data_files('psychopy')
 datas += [('task_config.py', '.')]
 datas += [('images', 'images')]
 
+# コンパイル済みテクスチャがある場合のみ追加（python stimulus_assets.py で作成）
+if os.path.exists('compiled_images'):
+    datas += [('compiled_images', 'compiled_images')]
+
 # google_config.pyがある場合のみ追加
 if os.path.exists('google_config.py'):
     datas += [('google_config.py', '.')]
@@ -47,6 +51,8 @@ a = Analysis(
         'google.oauth2',
         'google.oauth2.service_account',
         'google.auth',
+        'google.auth.transport.requests',
+        'result_schema',
         'json',
         'datetime',
         'os',
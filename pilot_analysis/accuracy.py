@@ -0,0 +1,38 @@
+"""
+正答率の計算（ベクトル化）
+
+正答列を「正答=1・誤答=0・未回答=NaN」の行列に一括で変換し、
+参加者ごとの正答率を配列演算で求めます。
+"""
+import numpy as np
+
+# 正答として扱う文字列（大文字化して比較）
+TRUE_STRINGS = ['TRUE', 'T']
+
+
+def correct_answer_matrix(df, correct_answer_cols):
+    """
+    正答列を 正答=1.0・誤答=0.0・未回答=NaN の行列（参加者×質問）に変換
+    True・1・'TRUE'・'T'（大文字小文字を問わない）を正答とする
+    """
+    matrix = np.full((len(df), len(correct_answer_cols)), np.nan)
+    for j, col in enumerate(correct_answer_cols):
+        values = df[col]
+        # True == 1 のため、真偽値・数値の列はこの比較のみで判定できる
+        correct = values.eq(1)
+        if values.dtype == object:
+            correct |= values.astype(str).str.upper().isin(TRUE_STRINGS)
+        matrix[:, j] = np.where(values.notna().to_numpy(), correct.to_numpy(), np.nan)
+    return matrix
+
+
+def accuracy_rates(matrix):
+    """
+    正答行列から参加者ごとの正答率（%）を計算（回答がない参加者はNaN）
+    """
+    answered_count = (~np.isnan(matrix)).sum(axis=1)
+    correct_count = np.nansum(matrix, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = correct_count / answered_count * 100
+    rates[answered_count == 0] = np.nan
+    return rates
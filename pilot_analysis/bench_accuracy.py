@@ -0,0 +1,90 @@
+"""
+正答率計算のベンチマーク
+
+従来の iterrows による計算と、accuracy.py のベクトル化した計算を
+架空のデータ（既定: 1万行・100万行）で比較し、結果が一致することも確認します。
+
+使い方:
+    python pilot_analysis/bench_accuracy.py
+    python pilot_analysis/bench_accuracy.py --rows 10000,1000000 --questions 11
+    python pilot_analysis/bench_accuracy.py --legacy-max-rows 100000   # 従来の計算は10万行までで推定
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from accuracy import correct_answer_matrix, accuracy_rates
+
+# 実データに現れる正答列の値の形式
+SAMPLE_VALUES = [True, False, 'TRUE', 'FALSE', 'T', 'F', 'true', 1, 0, np.nan]
+
+
+def make_answer_frame(rows, questions, seed=0):
+    """
+    架空の正答列（様々な形式の値と未回答を含む）を作成
+    """
+    rng = np.random.default_rng(seed)
+    values = np.array(SAMPLE_VALUES, dtype=object)
+    data = {
+        f"Q{i + 1}: 正答": values[rng.integers(0, len(values), size=rows)]
+        for i in range(questions)
+    }
+    return pd.DataFrame(data)
+
+
+def legacy_accuracy_rates(df, correct_answer_cols):
+    """
+    従来の計算（1行ずつ判定）
+    """
+    rates = []
+    for idx, row in df.iterrows():
+        correct_count = 0
+        total_count = 0
+        for col in correct_answer_cols:
+            if pd.notna(row[col]):
+                total_count += 1
+                if (row[col] == True or
+                    str(row[col]).upper() == 'TRUE' or
+                    str(row[col]).upper() == 'T' or
+                    row[col] == 1):
+                    correct_count += 1
+        rates.append((correct_count / total_count) * 100 if total_count > 0 else np.nan)
+    return np.array(rates, dtype=float)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="正答率計算のベンチマーク")
+    parser.add_argument('--rows', default="10000,1000000", help="行数（カンマ区切り）")
+    parser.add_argument('--questions', type=int, default=11, help="正答列の数")
+    parser.add_argument('--legacy-max-rows', type=int, default=None,
+                        help="従来の計算を実測する最大行数（超える場合は先頭部分の実測から推定）")
+    args = parser.parse_args(argv)
+
+    print(f"正答列: {args.questions}列")
+    print(f"{'行数':>10} {'従来 s':>10} {'ベクトル化 s':>12} {'高速化':>8} {'一致':>4}")
+
+    for rows in [int(r) for r in args.rows.split(',') if r.strip()]:
+        df = make_answer_frame(rows, args.questions)
+        cols = list(df.columns)
+
+        start_time = time.perf_counter()
+        vectorised = accuracy_rates(correct_answer_matrix(df, cols))
+        vectorised_time = time.perf_counter() - start_time
+
+        legacy_rows = rows if args.legacy_max_rows is None else min(rows, args.legacy_max_rows)
+        start_time = time.perf_counter()
+        legacy = legacy_accuracy_rates(df.iloc[:legacy_rows], cols)
+        legacy_time = (time.perf_counter() - start_time) * rows / legacy_rows
+        estimated = "（推定）" if legacy_rows < rows else ""
+
+        matches = np.allclose(legacy, vectorised[:legacy_rows], equal_nan=True)
+        print(f"{rows:>10} {legacy_time:>10.3f} {vectorised_time:>12.4f} "
+              f"{legacy_time / vectorised_time:>7.0f}x {'OK' if matches else 'NG':>4}{estimated}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
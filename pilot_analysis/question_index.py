@@ -0,0 +1,73 @@
+"""
+質問列の索引
+
+ヘッダー行の列名を先頭一致の正規表現（Q番号の直後に数字が続かないこと）で一度だけ解析し、
+質問番号ごとに回答列・正答列・その他の列（反応時間など）を対応付けます。
+'Q1' が 'Q17' や 'Q18' に一致することはありません。
+"""
+import re
+
+# 列名の先頭の質問番号（"Q19:正答"、"Q19: 正答"、"Q19: LOL_..._RT" など）
+QUESTION_PATTERN = re.compile(r'^\s*Q(\d+)(?!\d)')
+
+# 正答列の目印
+CORRECT_MARKER = '正答'
+
+
+def question_number(label):
+    """
+    'Q19' や 19 を質問番号（整数）に変換
+    """
+    if isinstance(label, int):
+        return label
+    match = QUESTION_PATTERN.match(str(label))
+    if match is None:
+        raise ValueError(f"質問番号を解釈できません: {label}")
+    return int(match.group(1))
+
+
+class QuestionColumnIndex:
+    """
+    質問番号 -> 回答列・正答列・その他の列 の索引
+    """
+
+    def __init__(self, columns):
+        self.answer = {}
+        self.correct = {}
+        self.metadata = {}
+
+        for col in columns:
+            match = QUESTION_PATTERN.match(str(col))
+            if match is None:
+                continue
+            q_num = int(match.group(1))
+
+            if CORRECT_MARKER in str(col) and q_num not in self.correct:
+                self.correct[q_num] = col
+            elif CORRECT_MARKER not in str(col) and not str(col).endswith('_RT') and q_num not in self.answer:
+                self.answer[q_num] = col
+            else:
+                self.metadata.setdefault(q_num, []).append(col)
+
+    def correct_columns(self, target_questions):
+        """
+        対象の質問の正答列（見つからない質問は警告を表示して除外）
+        """
+        columns = []
+        for label in target_questions:
+            col = self.correct.get(question_number(label))
+            if col is None:
+                print(f"警告: {label} の正答列が見つかりません")
+            else:
+                columns.append(col)
+        return columns
+
+    def answer_columns(self, target_questions):
+        """
+        対象の質問の回答列（見つからない質問は除外）
+        """
+        return [
+            self.answer[question_number(label)]
+            for label in target_questions
+            if question_number(label) in self.answer
+        ]
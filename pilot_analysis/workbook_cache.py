@@ -0,0 +1,205 @@
+"""
+入力ワークブックの読み込みキャッシュ
+
+Excelファイルの各シートを初回の読み込み時に列指向のファイル（Parquet）へ変換し、
+2回目以降はExcelを解析せずにキャッシュから読み込みます。キャッシュはファイル内容の
+SHA-256で管理するため、入力ファイルを更新すると自動的に作り直されます。
+（サイズと更新日時が変わっていなければハッシュの再計算も省略します）
+
+pyarrowがない場合や、型の混在した列を含みParquetに変換できないシートはpickleで保存します。
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  pandasのParquet入出力に使用
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+DEFAULT_CACHE_DIR = os.path.join("pilot_experiment_data", "cache")
+INDEX_NAME = "index.json"
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path):
+    """
+    ファイル内容のSHA-256ハッシュ
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+class WorkbookCache:
+    """
+    ワークブックのシート単位の読み込みキャッシュ
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self._excel_files = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _excel_file(self, file_path):
+        """
+        ExcelFileを開く（解析が必要な場合も1ファイルにつき1回のみ）
+        """
+        if file_path not in self._excel_files:
+            self._excel_files[file_path] = pd.ExcelFile(file_path, engine='openpyxl')
+        return self._excel_files[file_path]
+
+    def _content_hash(self, file_path):
+        """
+        入力ファイルの内容ハッシュ（サイズと更新日時が同じなら前回の値を使用）
+        """
+        index_path = os.path.join(self.cache_dir, INDEX_NAME)
+        index = _read_json(index_path, {})
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+
+        entry = index.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            return entry['sha256']
+
+        content_hash = file_sha256(file_path)
+        index[key] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': content_hash}
+        _write_json(index_path, index)
+        return content_hash
+
+    def _workbook_dir(self, file_path):
+        return os.path.join(self.cache_dir, self._content_hash(file_path)[:16])
+
+    def sheet_names(self, file_path):
+        """
+        シート名の一覧（キャッシュがあればExcelを開かない）
+        """
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            manifest = _read_json(os.path.join(self._workbook_dir(file_path), MANIFEST_NAME), None)
+            if manifest is not None:
+                return manifest['sheet_names']
+        return self._excel_file(file_path).sheet_names
+
+    def sheet_columns(self, file_path, sheet_name):
+        """
+        シートの列名（ヘッダー行のみ読み込み、キャッシュがあればExcelを開かない）
+        """
+        if self.enabled:
+            manifest = _read_json(os.path.join(self._workbook_dir(file_path), MANIFEST_NAME), None)
+            if manifest is not None and sheet_name in manifest.get('columns', {}):
+                return manifest['columns'][sheet_name]
+        header = pd.read_excel(self._excel_file(file_path), sheet_name=sheet_name, nrows=0)
+        return [str(col) for col in header.columns]
+
+    def read_sheets(self, file_path, sheet_names, columns=None):
+        """
+        指定したシートを読み込み（キャッシュにないシートのみExcelを解析して保存）
+        columns: シート名 -> 読み込む列のリスト（省略時は全列）
+        """
+        columns = columns or {}
+        if not self.enabled:
+            return {
+                sheet_name: pd.read_excel(
+                    self._excel_file(file_path), sheet_name=sheet_name, usecols=columns.get(sheet_name)
+                )
+                for sheet_name in sheet_names
+            }
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        workbook_dir = self._workbook_dir(file_path)
+        manifest_path = os.path.join(workbook_dir, MANIFEST_NAME)
+        manifest = _read_json(manifest_path, None)
+        if manifest is None:
+            manifest = {
+                'source': os.path.abspath(file_path),
+                'sheet_names': self._excel_file(file_path).sheet_names,
+                'sheets': {},
+                'columns': {}
+            }
+
+        sheets = {}
+        missing = []
+        for sheet_name in sheet_names:
+            entry = manifest['sheets'].get(sheet_name)
+            if entry and os.path.exists(os.path.join(workbook_dir, entry['file'])):
+                sheets[sheet_name] = self._read_cached(
+                    os.path.join(workbook_dir, entry['file']), entry['format'], columns.get(sheet_name)
+                )
+                self.hits += 1
+            else:
+                missing.append(sheet_name)
+
+        if missing:
+            self.misses += len(missing)
+            # キャッシュには全列を保存し、以降の読み込みで必要な列のみを取り出す
+            parsed = pd.read_excel(self._excel_file(file_path), sheet_name=missing)
+            os.makedirs(workbook_dir, exist_ok=True)
+            for sheet_name in missing:
+                df = parsed[sheet_name]
+                sheet_index = manifest['sheet_names'].index(sheet_name)
+                manifest['sheets'][sheet_name] = self._write_cached(df, workbook_dir, f"sheet{sheet_index}")
+                manifest.setdefault('columns', {})[sheet_name] = [str(col) for col in df.columns]
+                if columns.get(sheet_name) is not None:
+                    df = df[columns[sheet_name]]
+                sheets[sheet_name] = df
+            _write_json(manifest_path, manifest)
+
+        return sheets
+
+    @staticmethod
+    def _read_cached(path, file_format, columns=None):
+        """
+        キャッシュを読み込み（Parquetは指定した列のみを読み込む）
+        """
+        if file_format == 'parquet':
+            return pd.read_parquet(path, columns=columns)
+        df = pd.read_pickle(path)
+        return df if columns is None else df[columns]
+
+    @staticmethod
+    def _write_cached(df, workbook_dir, basename):
+        """
+        シートを保存（Parquetに変換できない場合はpickle）
+        """
+        if PARQUET_AVAILABLE:
+            filename = basename + ".parquet"
+            try:
+                df.to_parquet(os.path.join(workbook_dir, filename), compression='zstd')
+                return {'file': filename, 'format': 'parquet'}
+            except (ValueError, TypeError, ImportError, pyarrow.lib.ArrowException) as e:
+                print(f"Parquetに変換できないためpickleで保存します: {basename} ({e})")
+        filename = basename + ".pkl"
+        df.to_pickle(os.path.join(workbook_dir, filename))
+        return {'file': filename, 'format': 'pickle'}
+
+    def close(self):
+        for excel_file in self._excel_files.values():
+            excel_file.close()
+        self._excel_files = {}
+
+    def report(self):
+        if self.enabled:
+            print(f"ワークブックキャッシュ: ヒット {self.hits}シート / 解析 {self.misses}シート ({self.cache_dir})")
@@ -0,0 +1,73 @@
+"""
+結果の列構成（スキーマ）
+
+task_config.TASKS から参加者ごとの1行の列構成を一度だけ作成し、
+CSV保存とGoogle Spreadsheetへの保存で共有します。各試行の結果は
+列番号の対応表を使って、あらかじめ確保した行に直接書き込みます。
+"""
+
+# 参加者を識別する列
+KEY_COLUMNS = ['参加者名', '実施日時']
+
+# 試行ごとに出力するフレーム品質の項目
+FRAME_QUALITY_FIELDS = ['dropped_frames', 'max_frame_interval_ms', 'frame_interval_sd_ms']
+
+# spreadsheet_textの末尾に付く刺激条件
+STIMULUS_CONDITIONS = ['低刺激', '高刺激']
+
+
+def stimulus_condition(spreadsheet_text):
+    """spreadsheet_textから刺激条件（低刺激/高刺激）を取得（該当なしならNone）"""
+    for condition in STIMULUS_CONDITIONS:
+        if spreadsheet_text.endswith(f"_{condition}"):
+            return condition
+    return None
+
+
+class ResultSchema:
+    """参加者ごとの結果行の列構成クラス"""
+
+    def __init__(self, tasks):
+        self.columns = list(KEY_COLUMNS)
+
+        # 試行番号 -> [(結果のキー, 列番号), ...]
+        self.trial_fields = {}
+        # 試行番号 -> [(質問番号, spreadsheet_text), ...]
+        self.questions = {}
+
+        # 質問列（task_configの順序に従い、反応時間は回答列の隣に出力）
+        question_counter = 1
+        for trial_num, task in enumerate(tasks, 1):
+            fields = self.trial_fields.setdefault(trial_num, [])
+            questions = self.questions.setdefault(trial_num, [])
+            for question in task['questions']:
+                spreadsheet_text = question['spreadsheet_text']
+                questions.append((question_counter, spreadsheet_text))
+                column_header = f"Q{question_counter}: {spreadsheet_text}"
+
+                fields.append((spreadsheet_text, len(self.columns)))
+                self.columns.append(column_header)
+
+                fields.append((f"{spreadsheet_text}_RT", len(self.columns)))
+                self.columns.append(f"{column_header}_RT")
+                question_counter += 1
+
+        # 試行ごとのフレーム品質列
+        for trial_num in range(1, len(tasks) + 1):
+            fields = self.trial_fields[trial_num]
+            for field in FRAME_QUALITY_FIELDS:
+                fields.append((field, len(self.columns)))
+                self.columns.append(f"T{trial_num}: {field}")
+
+    def build_row(self, results, participant_name, started_at):
+        """試行ごとの結果から参加者の1行を作成（列の並びはself.columns）"""
+        row = [""] * len(self.columns)
+        row[0] = participant_name
+        row[1] = started_at
+
+        for result in results:
+            for key, index in self.trial_fields.get(result.get('trial_num'), ()):
+                value = result.get(key)
+                if value is not None:
+                    row[index] = value
+        return row
@@ -0,0 +1,222 @@
+"""
+ローカル結果データベース（SQLite）
+
+セッション・試行・回答を result/results.sqlite3 に記録します。試行ごとに
+1トランザクションで書き込み、WALモードのため実験中でも解析プロセスから
+読み込めます。参加者・ゲーム・刺激条件（低刺激/高刺激）で索引を作成します。
+
+解析での使い方:
+    from result_store import query_answers
+    df = query_answers(game='LOL', condition='高刺激')
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from result_schema import stimulus_condition
+
+DEFAULT_DB_PATH = os.path.join("result", "results.sqlite3")
+
+# 試行テーブルに記録する項目（試行結果のキー）
+TRIAL_FIELDS = [
+    'image_path', 'fixation_onset', 'stimulus_onset', 'stimulus_offset', 'blackout_onset',
+    'stimulus_duration_actual', 'fixation_frames', 'stimulus_frames', 'blackout_frames',
+    'dropped_frames', 'max_frame_interval_ms', 'frame_interval_sd_ms', 'refresh_rate',
+    'timestamp'
+]
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id INTEGER PRIMARY KEY,
+    participant TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    completed_at TEXT,
+    total_tasks INTEGER,
+    journal_path TEXT,
+    UNIQUE (participant, started_at)
+);
+CREATE TABLE IF NOT EXISTS trials (
+    session_id INTEGER NOT NULL REFERENCES sessions (session_id),
+    trial_num INTEGER NOT NULL,
+    game TEXT,
+    image_path TEXT,
+    fixation_onset REAL,
+    stimulus_onset REAL,
+    stimulus_offset REAL,
+    blackout_onset REAL,
+    stimulus_duration_actual REAL,
+    fixation_frames INTEGER,
+    stimulus_frames INTEGER,
+    blackout_frames INTEGER,
+    dropped_frames INTEGER,
+    max_frame_interval_ms REAL,
+    frame_interval_sd_ms REAL,
+    refresh_rate REAL,
+    timestamp TEXT,
+    PRIMARY KEY (session_id, trial_num)
+);
+CREATE TABLE IF NOT EXISTS answers (
+    session_id INTEGER NOT NULL REFERENCES sessions (session_id),
+    trial_num INTEGER NOT NULL,
+    question_num INTEGER NOT NULL,
+    question_key TEXT NOT NULL,
+    game TEXT,
+    condition TEXT,
+    answer TEXT,
+    rt REAL,
+    PRIMARY KEY (session_id, question_num)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_participant ON sessions (participant);
+CREATE INDEX IF NOT EXISTS idx_trials_game ON trials (game);
+CREATE INDEX IF NOT EXISTS idx_answers_game_condition ON answers (game, condition);
+CREATE INDEX IF NOT EXISTS idx_answers_question_key ON answers (question_key);
+"""
+
+
+def connect(db_path=DEFAULT_DB_PATH, readonly=False):
+    """データベースに接続（読み込み専用の接続は書き込み中のセッションを妨げない）"""
+    if readonly:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    else:
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # 試行結果はジャーナルにも同期済みのため、コミットごとのfsyncは省略
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA_SQL)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class ResultStore:
+    """結果データベースへの書き込みクラス（書き込みに失敗しても実験は継続）"""
+
+    def __init__(self, schema, game_of, db_path=DEFAULT_DB_PATH):
+        self.schema = schema
+        self.game_of = game_of
+        self.db_path = db_path
+        self.conn = None
+        self.session_id = None
+
+        try:
+            self.conn = connect(db_path)
+        except sqlite3.Error as e:
+            print(f"結果データベースを開けませんでした: {db_path} ({e})")
+
+    @property
+    def available(self):
+        return self.conn is not None
+
+    def _write(self, description, func, *args):
+        """1トランザクションで書き込み（失敗時は警告のみ）"""
+        if self.conn is None:
+            return False
+        try:
+            with self.conn:
+                func(*args)
+            return True
+        except sqlite3.Error as e:
+            print(f"結果データベースへの{description}に失敗しました: {e}")
+            return False
+
+    def begin_session(self, participant_info, total_tasks, journal_path=None):
+        """セッションを登録（再開時は既存のセッションを使用）"""
+        def insert():
+            self.conn.execute(
+                "INSERT OR IGNORE INTO sessions (participant, started_at, total_tasks, journal_path) "
+                "VALUES (?, ?, ?, ?)",
+                (participant_info['participant_name'], participant_info['session_started_at'],
+                 total_tasks, journal_path)
+            )
+            row = self.conn.execute(
+                "SELECT session_id FROM sessions WHERE participant = ? AND started_at = ?",
+                (participant_info['participant_name'], participant_info['session_started_at'])
+            ).fetchone()
+            self.session_id = row['session_id']
+
+        self._write("セッションの登録", insert)
+        return self.session_id
+
+    def _insert_trial(self, result):
+        trial_num = result['trial_num']
+        game = self.game_of(result['image_path'])
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO trials (session_id, trial_num, game, {', '.join(TRIAL_FIELDS)}) "
+            f"VALUES (?, ?, ?, {', '.join('?' for _ in TRIAL_FIELDS)})",
+            [self.session_id, trial_num, game] + [result.get(field) for field in TRIAL_FIELDS]
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO answers "
+            "(session_id, trial_num, question_num, question_key, game, condition, answer, rt) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (self.session_id, trial_num, question_num, spreadsheet_text, game,
+                 stimulus_condition(spreadsheet_text),
+                 None if result.get(spreadsheet_text) is None else str(result[spreadsheet_text]),
+                 result.get(f"{spreadsheet_text}_RT"))
+                for question_num, spreadsheet_text in self.schema.questions.get(trial_num, [])
+            ]
+        )
+
+    def record_trials(self, results):
+        """試行結果を記録（複数の試行は1トランザクションにまとめる）"""
+        if self.session_id is None:
+            return False
+
+        def insert():
+            for result in results:
+                self._insert_trial(result)
+
+        return self._write("試行の記録", insert)
+
+    def complete_session(self):
+        """セッションの完了を記録"""
+        if self.session_id is None:
+            return False
+        return self._write(
+            "完了の記録", self.conn.execute,
+            "UPDATE sessions SET completed_at = ? WHERE session_id = ?",
+            (datetime.now().isoformat(), self.session_id)
+        )
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def query_answers(db_path=DEFAULT_DB_PATH, participant=None, game=None, condition=None,
+                  completed_only=True):
+    """回答を条件で絞り込んで取得（参加者・ゲーム・刺激条件は索引を使用）"""
+    conditions = []
+    params = []
+    if participant is not None:
+        conditions.append("s.participant = ?")
+        params.append(participant)
+    if game is not None:
+        conditions.append("a.game = ?")
+        params.append(game)
+    if condition is not None:
+        conditions.append("a.condition = ?")
+        params.append(condition)
+    if completed_only:
+        conditions.append("s.completed_at IS NOT NULL")
+
+    sql = (
+        "SELECT s.participant, s.started_at, a.trial_num, a.question_num, a.question_key, "
+        "a.game, a.condition, a.answer, a.rt "
+        "FROM answers a JOIN sessions s ON s.session_id = a.session_id"
+    )
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY s.participant, s.started_at, a.question_num"
+
+    conn = connect(db_path, readonly=True)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
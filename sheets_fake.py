@@ -0,0 +1,228 @@
+"""
+Google Sheetsのローカル代替（ベンチマーク・動作確認用）
+
+実験で使うgspreadの操作（スプレッドシートのopen/create、ワークシートの取得・作成、
+get_all_values・row_values・batch_get・append_row・append_rows・batch_update）を
+メモリ上で再現します。応答遅延・エラー注入・1分あたりのリクエスト上限を設定できます。
+
+使い方:
+    from sheets_fake import FakeSheetsClient
+    from sheets_session import SheetsSession
+    client = FakeSheetsClient(latency=0.2, error_rate=0.05, quota_per_minute=60)
+    session = SheetsSession(None, "実験結果", "結果", client=client)
+"""
+import collections
+import random
+import re
+import threading
+import time
+
+from sheets_session import SpreadsheetNotFound, WorksheetNotFound
+
+
+class FakeAPIError(Exception):
+    """注入されたAPIエラー（statusはHTTPステータス相当）"""
+
+    def __init__(self, message, status=500):
+        super().__init__(f"[{status}] {message}")
+        self.status = status
+
+
+def _column_index(letters):
+    """列名（A, B, ..., AA）を0始まりの列番号に変換"""
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + (ord(letter) - ord('A') + 1)
+    return index - 1
+
+
+def parse_range(range_name):
+    """A1形式の範囲を (開始行, 終了行, 開始列, 終了列) に変換（0始まり、終了はNoneなら末尾まで）"""
+    range_name = range_name.split('!')[-1]
+    start, _, end = range_name.partition(':')
+    end = end or start
+
+    def parse(cell):
+        match = re.fullmatch(r'([A-Za-z]*)(\d*)', cell)
+        if match is None:
+            raise FakeAPIError(f"範囲を解釈できません: {range_name}", status=400)
+        letters, digits = match.groups()
+        column = _column_index(letters) if letters else None
+        row = int(digits) - 1 if digits else None
+        return row, column
+
+    start_row, start_col = parse(start)
+    end_row, end_col = parse(end)
+    return (
+        start_row or 0, None if end_row is None else end_row + 1,
+        start_col or 0, None if end_col is None else end_col + 1
+    )
+
+
+class FakeWorksheet:
+    """メモリ上のワークシート"""
+
+    def __init__(self, client, spreadsheet, title, rows=1000, cols=100):
+        self._client = client
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self._rows = []
+
+    def _grow(self, row_count):
+        while len(self._rows) < row_count:
+            self._rows.append([])
+        self.row_count = max(self.row_count, row_count)
+
+    def get_all_values(self):
+        self._client._request('get_all_values')
+        width = max((len(row) for row in self._rows), default=0)
+        return [list(row) + [''] * (width - len(row)) for row in self._rows]
+
+    def row_values(self, row):
+        self._client._request('row_values')
+        if row - 1 < len(self._rows):
+            return list(self._rows[row - 1])
+        return []
+
+    def batch_get(self, ranges):
+        self._client._request('batch_get')
+        results = []
+        for range_name in ranges:
+            start_row, end_row, start_col, end_col = parse_range(range_name)
+            values = []
+            for row in self._rows[start_row:end_row]:
+                values.append(list(row[start_col:end_col]))
+            # 末尾の空行は返さない（Sheets APIと同じ）
+            while values and not any(values[-1]):
+                values.pop()
+            results.append(values)
+        return results
+
+    def _append(self, rows):
+        # 表の末尾（最後の空でない行の次）に追加
+        last = len(self._rows)
+        while last > 0 and not any(self._rows[last - 1]):
+            last -= 1
+        del self._rows[last:]
+        for row in rows:
+            if len(row) > self.col_count:
+                self.col_count = len(row)
+            self._rows.append(['' if value is None else value for value in row])
+        self._grow(len(self._rows))
+
+    def append_row(self, values, value_input_option='RAW', table_range=None):
+        self._client._request('append_row')
+        self._append([values])
+
+    def append_rows(self, values, value_input_option='RAW', table_range=None):
+        self._client._request('append_rows')
+        self._append(values)
+
+    def batch_update(self, data, value_input_option='RAW'):
+        """[{'range': 'A1', 'values': [[...], ...]}, ...] の形式で書き込み"""
+        self._client._request('batch_update')
+        for update in data:
+            start_row, _, start_col, _ = parse_range(update['range'])
+            for row_offset, values in enumerate(update['values']):
+                row_index = start_row + row_offset
+                self._grow(row_index + 1)
+                row = self._rows[row_index]
+                if len(row) < start_col + len(values):
+                    row.extend([''] * (start_col + len(values) - len(row)))
+                row[start_col:start_col + len(values)] = values
+
+
+class FakeSpreadsheet:
+    """メモリ上のスプレッドシート"""
+
+    def __init__(self, client, title):
+        self._client = client
+        self.title = title
+        self.id = f"fake-{abs(hash(title)) % 10 ** 8:08d}"
+        self.url = f"https://docs.google.com/spreadsheets/d/{self.id}"
+        self._worksheets = collections.OrderedDict()
+        self._worksheets['Sheet1'] = FakeWorksheet(client, self, 'Sheet1')
+
+    def worksheets(self):
+        self._client._request('worksheets')
+        return list(self._worksheets.values())
+
+    def worksheet(self, title):
+        self._client._request('worksheet')
+        if title not in self._worksheets:
+            raise WorksheetNotFound(title)
+        return self._worksheets[title]
+
+    def add_worksheet(self, title, rows, cols):
+        self._client._request('add_worksheet')
+        if title in self._worksheets:
+            raise FakeAPIError(f"同名のワークシートが既にあります: {title}", status=400)
+        self._worksheets[title] = FakeWorksheet(self._client, self, title, rows, cols)
+        return self._worksheets[title]
+
+
+class FakeSheetsClient:
+    """gspreadクライアントの代替（遅延・エラー・リクエスト上限を再現）"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, quota_per_minute=None, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._request_times = collections.deque()
+        self._spreadsheets = {}
+
+        # 操作ごとのリクエスト数・注入したエラー数
+        self.request_counts = collections.Counter()
+        self.error_counts = collections.Counter()
+
+        # 次のリクエストで必ず失敗させる件数（再試行の確認用）
+        self.fail_next = 0
+
+    def _request(self, name):
+        """1リクエストの遅延・上限・エラーを再現"""
+        with self._lock:
+            self.request_counts[name] += 1
+
+            now = time.monotonic()
+            if self.quota_per_minute is not None:
+                while self._request_times and now - self._request_times[0] >= 60.0:
+                    self._request_times.popleft()
+                if len(self._request_times) >= self.quota_per_minute:
+                    self.error_counts['quota'] += 1
+                    raise FakeAPIError("Quota exceeded", status=429)
+                self._request_times.append(now)
+
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                self.error_counts['injected'] += 1
+                raise FakeAPIError(f"{name} failed", status=503)
+            fail = self._random.random() < self.error_rate
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            with self._lock:
+                self.error_counts['injected'] += 1
+            raise FakeAPIError(f"{name} failed", status=503)
+
+    def open(self, title):
+        self._request('open')
+        if title not in self._spreadsheets:
+            raise SpreadsheetNotFound(title)
+        return self._spreadsheets[title]
+
+    def create(self, title):
+        self._request('create')
+        spreadsheet = FakeSpreadsheet(self, title)
+        self._spreadsheets[title] = spreadsheet
+        return spreadsheet
+
+    def total_requests(self):
+        with self._lock:
+            return sum(self.request_counts.values())
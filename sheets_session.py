@@ -0,0 +1,267 @@
+"""
+Google Sheetsセッション
+
+認証済みクライアント・スプレッドシート・ワークシートのハンドルを保持し、
+プロセス内の全アップロードで共有します。アクセストークンは期限切れの
+ときのみ更新し、API呼び出しごとの所要時間を記録します。
+
+ヘッダー行は1行目のみを読み込んで確認し、確認済みのヘッダーの署名を
+ローカルにキャッシュします（シートを手動で編集した場合はキャッシュを削除してください）。
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import gspread
+    from google.oauth2.service_account import Credentials
+    from google.auth.transport.requests import Request
+    GSPREAD_AVAILABLE = True
+    SpreadsheetNotFound = gspread.SpreadsheetNotFound
+    WorksheetNotFound = gspread.WorksheetNotFound
+except ImportError:
+    GSPREAD_AVAILABLE = False
+
+    class SpreadsheetNotFound(Exception):
+        """スプレッドシートが見つからない（gspread未インストール時の代替）"""
+
+    class WorksheetNotFound(Exception):
+        """ワークシートが見つからない（gspread未インストール時の代替）"""
+
+
+class HeaderMismatchError(Exception):
+    """シートのヘッダー行が想定の列構成と一致しない"""
+
+
+def header_signature(header):
+    """ヘッダー行（列の並び）の署名"""
+    return hashlib.sha256("\x1f".join(str(column) for column in header).encode('utf-8')).hexdigest()
+
+
+def column_letter(index):
+    """0始まりの列番号をA1形式の列名に変換（0 -> A, 26 -> AA）"""
+    letters = ''
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+
+class SheetsSession:
+    """認証済みのGoogle Sheetsセッションクラス"""
+
+    # 確認済みヘッダーの署名のキャッシュ
+    HEADER_CACHE_PATH = os.path.join("result", ".sheets_header_cache.json")
+
+    def __init__(self, service_account_info, spreadsheet_name, worksheet_name, client=None,
+                 header_cache_path=None):
+        self.service_account_info = service_account_info
+        self.spreadsheet_name = spreadsheet_name
+        self.worksheet_name = worksheet_name
+        self.header_cache_path = header_cache_path or self.HEADER_CACHE_PATH
+        self._header_cache = self._load_header_cache()
+
+        # clientを渡した場合は認証を行わない（テスト用のクライアントなど）
+        self._client = client
+        self._credentials = None
+        self._spreadsheet = None
+        self._worksheets = {}
+        self._lock = threading.RLock()
+
+        # API呼び出しごとの所要時間（名前 -> [回数, 合計秒, 最大秒]）
+        self.call_stats = {}
+
+    def call(self, name, func, *args, **kwargs):
+        """API呼び出しを実行し、所要時間を記録"""
+        start_time = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            with self._lock:
+                stats = self.call_stats.setdefault(name, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+
+    def client(self):
+        """認証済みクライアントを取得（トークンは期限切れのときのみ更新）"""
+        with self._lock:
+            if self._client is None:
+                self._credentials = self.call(
+                    'credentials',
+                    Credentials.from_service_account_info,
+                    self.service_account_info,
+                    scopes=SCOPES
+                )
+                self.call('refresh_token', self._credentials.refresh, Request())
+                self._client = self.call('authorize', gspread.authorize, self._credentials)
+            elif self._credentials is not None and not self._credentials.valid:
+                self.call('refresh_token', self._credentials.refresh, Request())
+            return self._client
+
+    def spreadsheet(self):
+        """スプレッドシートを取得（存在しない場合は作成）"""
+        with self._lock:
+            if self._spreadsheet is None:
+                client = self.client()
+                try:
+                    self._spreadsheet = self.call('open', client.open, self.spreadsheet_name)
+                except SpreadsheetNotFound:
+                    self._spreadsheet = self.call('create', client.create, self.spreadsheet_name)
+                    print(f"新しいスプレッドシートを作成しました: {self.spreadsheet_name}")
+            return self._spreadsheet
+
+    def worksheet(self, title=None, rows=1000, cols=100):
+        """ワークシートを取得（存在しない場合は作成）"""
+        title = title or self.worksheet_name
+        with self._lock:
+            if title not in self._worksheets:
+                spreadsheet = self.spreadsheet()
+                try:
+                    worksheet = self.call('worksheet', spreadsheet.worksheet, title)
+                except WorksheetNotFound:
+                    worksheet = self.call(
+                        'add_worksheet', spreadsheet.add_worksheet,
+                        title=title, rows=rows, cols=cols
+                    )
+                self._worksheets[title] = worksheet
+            return self._worksheets[title]
+
+    def _load_header_cache(self):
+        try:
+            with open(self.header_cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_header_cache(self):
+        try:
+            cache_dir = os.path.dirname(self.header_cache_path)
+            if cache_dir and not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            with open(self.header_cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self._header_cache, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"ヘッダーキャッシュの保存に失敗しました: {e}")
+
+    def _existing_worksheet(self, title):
+        """既存のワークシートを取得（存在しない場合はNone、作成しない）"""
+        with self._lock:
+            if title not in self._worksheets:
+                try:
+                    self._worksheets[title] = self.call('worksheet', self.spreadsheet().worksheet, title)
+                except WorksheetNotFound:
+                    return None
+            return self._worksheets[title]
+
+    def ensure_header(self, expected_header, on_mismatch='version', create=True):
+        """
+        ヘッダー行を確認し、書き込み先のワークシートを返します。
+        1行目のみを読み込み、空ならヘッダーを書き込みます。
+        列構成が一致しない場合は、on_mismatch='reject' なら HeaderMismatchError を送出し、
+        'version' なら署名付きの別ワークシートに書き込みます。
+        create=False の場合はワークシートの作成・ヘッダーの書き込みを行わず、
+        書き込み先がまだ存在しなければNoneを返します（確認のみの実行用）。
+        """
+        signature = header_signature(expected_header)
+        titles = [self.worksheet_name, f"{self.worksheet_name}_{signature[:8]}"]
+
+        with self._lock:
+            for title in titles:
+                cache_key = f"{self.spreadsheet_name}/{title}"
+                cached = self._header_cache.get(cache_key)
+                if cached == signature:
+                    return self.worksheet(title)
+
+                if cached is None:
+                    if create:
+                        worksheet = self.worksheet(title, cols=max(100, len(expected_header)))
+                    else:
+                        worksheet = self._existing_worksheet(title)
+                        if worksheet is None:
+                            return None
+                    first_row = self.call('row_values', worksheet.row_values, 1)
+
+                    if not any(first_row):
+                        if not create:
+                            return worksheet
+                        self.call('append_row', worksheet.append_row, list(expected_header))
+                        cached = signature
+                    else:
+                        cached = header_signature(first_row)
+
+                    self._header_cache[cache_key] = cached
+                    self._save_header_cache()
+                    if cached == signature:
+                        return worksheet
+
+                # 列構成が一致しない
+                if on_mismatch == 'reject':
+                    raise HeaderMismatchError(
+                        f"ワークシート '{title}' のヘッダーが現在の列構成と一致しません"
+                    )
+                print(f"警告: ワークシート '{title}' のヘッダーが現在の列構成と一致しません。")
+
+            raise HeaderMismatchError(
+                f"ヘッダーが一致するワークシートがありません: {', '.join(titles)}"
+            )
+
+    def existing_keys(self, worksheet, header, key_columns):
+        """ワークシートにある行のキー（key_columnsの値の組）を取得（キーの列のみ読み込む）"""
+        ranges = []
+        for column in key_columns:
+            letter = column_letter(list(header).index(column))
+            ranges.append(f"{letter}2:{letter}")
+        columns = self.call('batch_get', worksheet.batch_get, ranges)
+
+        length = max((len(values) for values in columns), default=0)
+        padded = [
+            [(row[0] if row else '') for row in values] + [''] * (length - len(values))
+            for values in columns
+        ]
+        return {key for key in zip(*padded) if any(key)}
+
+    def invalidate(self):
+        """スプレッドシート・ワークシートのハンドルを破棄（エラー後に再取得させる）"""
+        with self._lock:
+            self._spreadsheet = None
+            self._worksheets = {}
+
+    def report(self):
+        """API呼び出しごとの所要時間を表示"""
+        with self._lock:
+            stats = sorted(self.call_stats.items())
+        if not stats:
+            return
+        print("Google Sheets API呼び出し:")
+        for name, (count, total, maximum) in stats:
+            print(f"  {name}: {count}回 (平均 {total / count * 1000:.0f}ms, 最大 {maximum * 1000:.0f}ms)")
+
+
+# プロセス内で共有するセッション
+_shared_session = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_session(service_account_info, spreadsheet_name, worksheet_name):
+    """プロセス内で共有するセッションを取得（初回のみ作成）"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = SheetsSession(service_account_info, spreadsheet_name, worksheet_name)
+        return _shared_session
+
+
+def shared_session():
+    """作成済みの共有セッション（未作成ならNone）"""
+    return _shared_session
@@ -0,0 +1,249 @@
+"""
+刺激画像アセットのコンパイル
+
+task_config.TASKS の画像を表示解像度に合わせて事前に縮小し、
+無圧縮RGBAテクスチャとして書き出します。実験実行時はデコードせずに
+メモリマップで読み込むため、読み込みがほぼ一瞬で完了します。
+
+使い方:
+    python stimulus_assets.py                                  # 既定の解像度で作成
+    python stimulus_assets.py --resolution 1920x1080 --resolution 2560x1440
+    python stimulus_assets.py --force                          # 全画像を再作成
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+
+from PIL import Image
+
+# 出力先とマニフェスト
+COMPILED_DIR = "compiled_images"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# 既定の対象解像度（画面サイズ、24インチ相当の上限を含む）
+DEFAULT_RESOLUTIONS = [(1920, 1080), (2560, 1440), (1470, 956)]
+
+# 24インチ相当の表示幅（ExperimentDisplayの'24inch_max'モードと同じ値）
+REFERENCE_WIDTH = 2560
+
+
+def target_pixel_size(screen_width, screen_height, image_scale):
+    """画面サイズとnorm単位の表示スケールから画像のピクセルサイズを計算"""
+    return (
+        int(round(screen_width * image_scale / 2.0)),
+        int(round(screen_height * image_scale / 2.0))
+    )
+
+
+def display_pixel_size(screen_width, screen_height):
+    """'24inch_max'モードでの画像のピクセルサイズを計算"""
+    if screen_width <= REFERENCE_WIDTH:
+        return (screen_width, screen_height)
+    scale_ratio = REFERENCE_WIDTH / screen_width
+    return target_pixel_size(screen_width, screen_height, 2.0 * scale_ratio)
+
+
+def file_sha256(path):
+    """ファイル内容のSHA-256ハッシュ"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def texture_key(content_hash, pixel_size):
+    """マニフェストのキー（内容ハッシュ＋ピクセルサイズ）"""
+    return f"{content_hash}@{pixel_size[0]}x{pixel_size[1]}"
+
+
+def load_manifest(asset_dir=COMPILED_DIR):
+    """マニフェストを読み込み（存在しない場合は空のマニフェスト）"""
+    manifest_path = os.path.join(asset_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+            print(f"マニフェストのバージョンが異なるため再作成します: {manifest_path}")
+        except Exception as e:
+            print(f"マニフェストの読み込みに失敗しました: {e}")
+    return {'version': MANIFEST_VERSION, 'sources': {}, 'textures': {}}
+
+
+def save_manifest(manifest, asset_dir=COMPILED_DIR):
+    """マニフェストを保存（書き込み途中で壊れないよう置き換えで保存）"""
+    manifest_path = os.path.join(asset_dir, MANIFEST_NAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def _source_stat(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime
+
+
+def compile_assets(tasks, resolutions=None, asset_dir=COMPILED_DIR, force=False):
+    """全刺激画像を対象解像度ごとのRGBAテクスチャに変換（変更のない画像はスキップ）"""
+    resolutions = resolutions or DEFAULT_RESOLUTIONS
+    os.makedirs(asset_dir, exist_ok=True)
+    manifest = {'version': MANIFEST_VERSION, 'sources': {}, 'textures': {}} if force else load_manifest(asset_dir)
+
+    image_paths = list(dict.fromkeys(task['image_path'] for task in tasks))
+    pixel_sizes = list(dict.fromkeys(display_pixel_size(w, h) for w, h in resolutions))
+
+    compiled = 0
+    skipped = 0
+
+    for image_path in image_paths:
+        if not os.path.exists(image_path):
+            print(f"画像が見つかりません: {image_path}")
+            continue
+
+        size, mtime = _source_stat(image_path)
+        source = manifest['sources'].get(image_path)
+        if source and source['size'] == size and source['mtime'] == mtime:
+            content_hash = source['sha256']
+        else:
+            content_hash = file_sha256(image_path)
+        manifest['sources'][image_path] = {'sha256': content_hash, 'size': size, 'mtime': mtime}
+
+        source_image = None
+        for pixel_size in pixel_sizes:
+            key = texture_key(content_hash, pixel_size)
+            entry = manifest['textures'].get(key)
+            expected_bytes = pixel_size[0] * pixel_size[1] * 4
+            if (entry and
+                    os.path.exists(os.path.join(asset_dir, entry['file'])) and
+                    os.path.getsize(os.path.join(asset_dir, entry['file'])) == expected_bytes):
+                skipped += 1
+                continue
+
+            if source_image is None:
+                source_image = Image.open(image_path).convert('RGBA')
+
+            scaled = source_image.resize(pixel_size, Image.LANCZOS)
+            filename = f"{content_hash[:16]}_{pixel_size[0]}x{pixel_size[1]}.rgba"
+            with open(os.path.join(asset_dir, filename), 'wb') as f:
+                f.write(scaled.tobytes())
+
+            manifest['textures'][key] = {
+                'file': filename,
+                'source': image_path,
+                'width': pixel_size[0],
+                'height': pixel_size[1],
+                'format': 'RGBA'
+            }
+            compiled += 1
+            print(f"作成: {image_path} -> {filename}")
+
+    save_manifest(manifest, asset_dir)
+    print(f"アセットのコンパイル完了: 作成 {compiled}件 / スキップ {skipped}件")
+    return compiled, skipped
+
+
+class CompiledStimulusStore:
+    """コンパイル済みテクスチャの読み込みクラス（メモリマップで読み込む）"""
+
+    def __init__(self, pixel_size, asset_dir=COMPILED_DIR):
+        self.pixel_size = tuple(pixel_size)
+        self.asset_dir = asset_dir
+        manifest_path = os.path.join(asset_dir, MANIFEST_NAME)
+        self.manifest = load_manifest(asset_dir) if os.path.exists(manifest_path) else None
+
+        # 画像パス -> 内容ハッシュ（ハッシュの再計算は1画像につき1回のみ）
+        self._content_hashes = {}
+        # 警告済みの画像パス（先読みで同じ画像を何度も読み込むため）
+        self._warned = set()
+
+    @property
+    def available(self):
+        return self.manifest is not None
+
+    def _warn(self, image_path, reason):
+        if image_path not in self._warned:
+            self._warned.add(image_path)
+            print(f"警告: コンパイル済みテクスチャを使用できません（元画像をデコードします）: "
+                  f"{image_path} - {reason}")
+
+    def _content_hash(self, image_path):
+        """元画像の内容ハッシュ（サイズと更新日時がマニフェストと同じならハッシュの計算を省略）"""
+        if image_path not in self._content_hashes:
+            source = self.manifest['sources'].get(image_path)
+            size, mtime = _source_stat(image_path)
+            if source and source['size'] == size and source['mtime'] == mtime:
+                self._content_hashes[image_path] = source['sha256']
+            else:
+                # 更新日時のみが変わった場合（コピーやチェックアウト）も内容が同じなら使用できる
+                self._content_hashes[image_path] = file_sha256(image_path)
+        return self._content_hashes[image_path]
+
+    def load(self, image_path):
+        """コンパイル済みテクスチャをPIL画像として取得（該当なしならNone）"""
+        if self.manifest is None or not os.path.exists(image_path):
+            return None
+
+        # 元画像の内容ハッシュで照合する（内容が更新されていたら古いテクスチャは使わない）
+        content_hash = self._content_hash(image_path)
+        entry = self.manifest['textures'].get(texture_key(content_hash, self.pixel_size))
+        if entry is None:
+            source = self.manifest['sources'].get(image_path)
+            if source is None and not any(
+                    key.startswith(f"{content_hash}@") for key in self.manifest['textures']):
+                self._warn(image_path, "マニフェストに登録されていません")
+            elif source is not None and source['sha256'] != content_hash:
+                self._warn(image_path, "コンパイル後に元画像が変更されています")
+            else:
+                width, height = self.pixel_size
+                self._warn(image_path, f"{width}x{height} のテクスチャがありません"
+                                       f"（この画面の解像度を --resolution で指定してコンパイルしてください）")
+            return None
+
+        texture_path = os.path.join(self.asset_dir, entry['file'])
+        width, height = entry['width'], entry['height']
+        if not os.path.exists(texture_path):
+            self._warn(image_path, f"テクスチャファイルがありません: {texture_path}")
+            return None
+        with open(texture_path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(buffer) != width * height * 4:
+            self._warn(image_path, f"テクスチャファイルのサイズが一致しません: {texture_path}")
+            return None
+        return Image.frombuffer('RGBA', (width, height), buffer, 'raw', 'RGBA', 0, 1)
+
+
+def _parse_resolution(text):
+    try:
+        width, height = text.lower().split('x')
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"解像度は 幅x高さ の形式で指定してください: {text}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="刺激画像を表示解像度のRGBAテクスチャに変換します")
+    parser.add_argument('--resolution', action='append', type=_parse_resolution,
+                        help="対象の画面解像度（例: 1920x1080）。複数指定可")
+    parser.add_argument('--output', default=COMPILED_DIR, help="出力ディレクトリ")
+    parser.add_argument('--force', action='store_true', help="変更の有無に関わらず全て再作成")
+    args = parser.parse_args(argv)
+
+    try:
+        from task_config import TASKS
+    except ImportError:
+        print("Error: task_config.py not found.")
+        return 1
+
+    compile_assets(TASKS, args.resolution, args.output, args.force)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,6 +11,12 @@ TIMING_CONFIG = {
     'blackout_duration': 1.5   # ブラックアウト時間（秒）
 }
 
+# 刺激画像の読み込み設定
+STIMULUS_CONFIG = {
+    'loading_mode': 'preload',        # 'preload': 開始前に全画像を読み込み / 'prefetch': 次試行の画像を回答中に先読み
+    'prefetch_memory_budget_mb': 256  # 先読みキャッシュのメモリ上限（MB）
+}
+
 GAME_INFO = {
     'VALO': {
         'name': 'VALORANT',
@@ -376,4 +382,8 @@ TASKS = [
             }
         ]
     }
-]
\ No newline at end of file
+]
+
+# 結果の列構成（CSV保存とGoogle Spreadsheetへの保存で共有）
+from result_schema import ResultSchema
+RESULT_SCHEMA = ResultSchema(TASKS)